@@ -15,7 +15,7 @@ import uvicorn
 import debug_logger
 from project_manager import PROJECTS_DIR, ensure_default_project
 from providers import PROVIDERS
-from providers.base import API_KEYS
+from providers.base import API_KEYS, close_http_client
 from routers.burn import router as burn_router
 from routers.captions import router as captions_router
 from routers.clipper import router as clipper_router
@@ -156,6 +156,7 @@ async def lifespan(app: FastAPI):
         await stop_sounds_bot()
     except Exception:
         pass
+    await close_http_client()
     log.info("Content Posting Lab shutting down...")
 
 
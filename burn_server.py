@@ -544,7 +544,8 @@ async def api_burn_zip(batch_id: str):
         return JSONResponse({"error": "No burned files in batch"}, status_code=404)
 
     zip_path = str(batch_dir / f"{batch_id}.zip")
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+    # Burned MP4s are already compressed; DEFLATE would only burn CPU.
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
         for mp4 in mp4s:
             zf.write(mp4, mp4.name)
 
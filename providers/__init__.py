@@ -1,4 +1,5 @@
 from . import grok, replicate
+from .base import API_KEYS
 
 PROVIDERS = {
     "grok": {
@@ -60,3 +61,22 @@ PROVIDERS = {
         "variant": "vertical",
     },
 }
+
+
+# Public (JSON-safe) provider listings, keyed by which API keys are set. Keys
+# are fixed at import in production; keying on them keeps tests that
+# monkeypatch API_KEYS honest.
+_available_cache: dict[frozenset, list[dict]] = {}
+
+
+def available_providers() -> list[dict]:
+    """Providers whose API key is configured, without the module handle."""
+    configured = frozenset(k for k, v in API_KEYS.items() if v)
+    cached = _available_cache.get(configured)
+    if cached is None:
+        cached = _available_cache[configured] = [
+            {"id": pid, **{k: v for k, v in info.items() if k != "module"}}
+            for pid, info in PROVIDERS.items()
+            if info["key_id"] in configured
+        ]
+    return cached
@@ -1,6 +1,7 @@
 """Shared utilities for all video generation providers."""
 
 import asyncio
+import base64
 import logging
 import os
 import re
@@ -9,6 +10,8 @@ from pathlib import Path
 import httpx
 from dotenv import load_dotenv
 
+from services.ffmpeg import CROP_ENCODE_ARGS
+
 log = logging.getLogger("providers")
 
 load_dotenv()
@@ -28,14 +31,81 @@ API_KEYS = {
 # Providers that always output 16:9 regardless of aspect_ratio setting
 FORCE_LANDSCAPE = {"hailuo", "pruna-pvideo"}
 
+# Provider status polling backs off from POLL_INITIAL_DELAY to POLL_MAX_DELAY:
+# quick jobs are noticed within a second, long ones aren't polled every few
+# seconds for minutes.
+POLL_INITIAL_DELAY = 0.5
+POLL_MAX_DELAY = 8.0
+
+
+def next_poll_delay(delay: float) -> float:
+    return min(delay * 1.5, POLL_MAX_DELAY)
+
+
+# Read size for encode_data_uri; a multiple of 3 so chunks encode unpadded.
+_B64_CHUNK = 3 * 64 * 1024
+
+
+def encode_data_uri(fileobj, content_type: str) -> str:
+    """Base64 a (spooled) upload into a data URI without a full raw copy.
+
+    Blocking -- call via asyncio.to_thread.
+    """
+    size = fileobj.seek(0, os.SEEK_END)
+    fileobj.seek(0)
+    prefix = f"data:{content_type};base64,".encode("ascii")
+    # Sized up front so the encoded chunks are copied in once, with no regrowth
+    buf = bytearray(len(prefix) + (size + 2) // 3 * 4)
+    buf[: len(prefix)] = prefix
+    pos = len(prefix)
+    carry = b""
+    while chunk := fileobj.read(_B64_CHUNK):
+        if carry:
+            chunk = carry + chunk
+        cut = len(chunk) - len(chunk) % 3
+        encoded = base64.b64encode(chunk[:cut])
+        buf[pos : pos + len(encoded)] = encoded
+        pos += len(encoded)
+        carry = chunk[cut:]
+    encoded = base64.b64encode(carry)
+    buf[pos : pos + len(encoded)] = encoded
+    del buf[pos + len(encoded) :]
+    return buf.decode("ascii")
+
+
+# One pooled client for every generation: provider submit/poll calls and the
+# CDN download reuse warm TLS connections instead of a fresh client per video.
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 async def download_video(client: httpx.AsyncClient, url: str, dest: Path):
-    """Download a video from URL to local file."""
+    """Download a video from URL to local file.
+
+    1 MiB chunks written from a worker thread: few await/syscall boundaries
+    per file and no disk I/O on the event loop. (BufferedWriter hands chunks
+    bigger than its buffer straight to the OS, so no extra copy.)
+    """
     async with client.stream("GET", url, timeout=120) as resp:
         resp.raise_for_status()
         with open(dest, "wb") as f:
-            async for chunk in resp.aiter_bytes(8192):
-                f.write(chunk)
+            async for chunk in resp.aiter_bytes(1024 * 1024):
+                await asyncio.to_thread(f.write, chunk)
 
 
 async def crop_to_vertical(src: Path) -> None:
@@ -48,8 +118,7 @@ async def crop_to_vertical(src: Path) -> None:
         str(src),
         "-vf",
         "crop=ih*9/16:ih",
-        "-c:a",
-        "copy",
+        *CROP_ENCODE_ARGS,
         str(tmp),
         stdout=asyncio.subprocess.DEVNULL,
         stderr=asyncio.subprocess.PIPE,
@@ -117,7 +186,7 @@ async def multi_crop_vertical(src: Path, mode: str) -> list[Path]:
             "ffmpeg", "-y",
             "-i", str(src),
             "-vf", f"crop={crop_w}:{src_h}:{x}:0",
-            "-c:a", "copy",
+            *CROP_ENCODE_ARGS,
             str(out),
             stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
@@ -131,10 +200,21 @@ async def multi_crop_vertical(src: Path, mode: str) -> list[Path]:
     return outputs
 
 
+# ASCII slug table: [a-z0-9] kept, everything else becomes a space so that
+# split()/join collapses runs to one "_" and trims the ends.
+_SLUG_TABLE = {
+    i: chr(i) if chr(i).isdigit() or "a" <= chr(i) <= "z" else " " for i in range(128)
+}
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
 def slugify(text: str, max_len: int = 40) -> str:
     """Turn a prompt into a filesystem-safe folder name."""
     s = text.lower().strip()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
+    if s.isascii():
+        s = "_".join(s.translate(_SLUG_TABLE).split())
+    else:
+        s = _SLUG_RE.sub("_", s).strip("_")
     return s[:max_len] or "untitled"
 
 
@@ -173,62 +253,62 @@ async def generate_one(
         sub_dir.mkdir(parents=True, exist_ok=True)
         rel_dir = f"{provider}/{folder}"
 
-        async with httpx.AsyncClient() as client:
-            entry["status"] = "generating"
-            log.info("job=%s idx=%d provider=%s starting", job_id, index, provider)
-
-            provider_info = PROVIDERS[provider]
-            mod = provider_info["module"]
-
-            params = {
-                "aspect_ratio": aspect_ratio,
-                "resolution": resolution,
-                "duration": duration,
-                "image_data_uri": image_data_uri,
-                "entry": entry,
-                "model_id": provider_info["models"][0],
-                "variant": provider_info.get("variant"),
-                **extra,
-            }
-
-            video_url = await mod.generate(prompt, params, client)
-
-            filename = f"{job_id}_{index}.mp4"
-            dest = sub_dir / filename
-            entry["status"] = "downloading"
-            await download_video(client, video_url, dest)
-
-            # Multi-crop mode: split one 16:9 into multiple 9:16 crops
-            crop_mode = extra.get("crop_mode")
-            if crop_mode in ("dual", "triptych", "both") and provider in FORCE_LANDSCAPE:
-                entry["status"] = "cropping"
-                crop_paths = await multi_crop_vertical(dest, crop_mode)
-                # Store crop files in the entry
-                entry["status"] = "done"
-                entry["crops"] = []
-                for cp in crop_paths:
-                    crop_rel = f"{rel_dir}/{cp.name}"
-                    entry["crops"].append({
-                        "file": crop_rel,
-                        "url": f"{url_prefix}/{crop_rel}",
-                    })
-                # Use the first crop as the primary file
-                entry["file"] = entry["crops"][0]["file"]
-                entry["url"] = entry["crops"][0]["url"]
-            elif aspect_ratio == "9:16" and provider in FORCE_LANDSCAPE:
-                # Auto-crop to 9:16 for providers that only output 16:9
-                entry["status"] = "cropping"
-                await crop_to_vertical(dest)
-                entry["status"] = "done"
-                entry["file"] = f"{rel_dir}/{filename}"
-                entry["url"] = f"{url_prefix}/{rel_dir}/{filename}"
-            else:
-                entry["status"] = "done"
-                entry["file"] = f"{rel_dir}/{filename}"
-                entry["url"] = f"{url_prefix}/{rel_dir}/{filename}"
-            log.info("job=%s idx=%d done: %s", job_id, index, entry['file'])
-            if on_complete:
-                on_complete(job_id)
+        client = get_http_client()
+        entry["status"] = "generating"
+        log.info("job=%s idx=%d provider=%s starting", job_id, index, provider)
+
+        provider_info = PROVIDERS[provider]
+        mod = provider_info["module"]
+
+        params = {
+            "aspect_ratio": aspect_ratio,
+            "resolution": resolution,
+            "duration": duration,
+            "image_data_uri": image_data_uri,
+            "entry": entry,
+            "model_id": provider_info["models"][0],
+            "variant": provider_info.get("variant"),
+            **extra,
+        }
+
+        video_url = await mod.generate(prompt, params, client)
+
+        filename = f"{job_id}_{index}.mp4"
+        dest = sub_dir / filename
+        entry["status"] = "downloading"
+        await download_video(client, video_url, dest)
+
+        # Multi-crop mode: split one 16:9 into multiple 9:16 crops
+        crop_mode = extra.get("crop_mode")
+        if crop_mode in ("dual", "triptych", "both") and provider in FORCE_LANDSCAPE:
+            entry["status"] = "cropping"
+            crop_paths = await multi_crop_vertical(dest, crop_mode)
+            # Store crop files in the entry
+            entry["status"] = "done"
+            entry["crops"] = []
+            for cp in crop_paths:
+                crop_rel = f"{rel_dir}/{cp.name}"
+                entry["crops"].append({
+                    "file": crop_rel,
+                    "url": f"{url_prefix}/{crop_rel}",
+                })
+            # Use the first crop as the primary file
+            entry["file"] = entry["crops"][0]["file"]
+            entry["url"] = entry["crops"][0]["url"]
+        elif aspect_ratio == "9:16" and provider in FORCE_LANDSCAPE:
+            # Auto-crop to 9:16 for providers that only output 16:9
+            entry["status"] = "cropping"
+            await crop_to_vertical(dest)
+            entry["status"] = "done"
+            entry["file"] = f"{rel_dir}/{filename}"
+            entry["url"] = f"{url_prefix}/{rel_dir}/{filename}"
+        else:
+            entry["status"] = "done"
+            entry["file"] = f"{rel_dir}/{filename}"
+            entry["url"] = f"{url_prefix}/{rel_dir}/{filename}"
+        log.info("job=%s idx=%d done: %s", job_id, index, entry['file'])
+        if on_complete:
+            on_complete(job_id)
     except Exception as e:
         err_msg = str(e) or repr(e)
         log.error("job=%s idx=%d provider=%s error: %s", job_id, index, provider, err_msg, exc_info=True)
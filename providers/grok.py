@@ -3,7 +3,7 @@ import time
 
 import httpx
 
-from .base import API_KEYS
+from .base import API_KEYS, POLL_INITIAL_DELAY, next_poll_delay
 
 
 async def generate(prompt: str, params: dict, client: httpx.AsyncClient) -> str:
@@ -38,13 +38,14 @@ async def generate(prompt: str, params: dict, client: httpx.AsyncClient) -> str:
     entry["provider_request_id"] = request_id
     entry["status"] = "polling"
 
+    poll_url = f"https://api.x.ai/v1/videos/{request_id}"
+    poll_headers = {"Authorization": f"Bearer {key}"}
     deadline = time.time() + 600
+    delay = POLL_INITIAL_DELAY
     while time.time() < deadline:
-        r = await client.get(
-            f"https://api.x.ai/v1/videos/{request_id}",
-            headers={"Authorization": f"Bearer {key}"},
-            timeout=30,
-        )
+        await asyncio.sleep(delay)
+        delay = next_poll_delay(delay)
+        r = await client.get(poll_url, headers=poll_headers, timeout=30)
         data = r.json()
         if "video" in data:
             return data["video"]["url"]
@@ -53,5 +54,4 @@ async def generate(prompt: str, params: dict, client: httpx.AsyncClient) -> str:
         status = data.get("status", "")
         if status == "expired":
             raise RuntimeError("xAI request expired")
-        await asyncio.sleep(5)
     raise RuntimeError("xAI generation timed out")
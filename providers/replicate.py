@@ -5,10 +5,15 @@ import time
 
 import httpx
 
-from .base import API_KEYS
+from .base import API_KEYS, POLL_INITIAL_DELAY, next_poll_delay
 
 REPLICATE_API = "https://api.replicate.com/v1"
 
+# Replicate's sync mode: the create call blocks up to this many seconds and
+# returns the finished prediction if it completes in time, so short jobs need
+# no polling at all.
+_CREATE_WAIT_SECS = 60
+
 
 def _build_hailuo_input(prompt: str, params: dict) -> dict:
     """Build Replicate input payload for MiniMax Hailuo 2.3."""
@@ -165,22 +170,21 @@ async def generate(prompt: str, params: dict, client: httpx.AsyncClient) -> str:
 
     resp = await client.post(
         f"{REPLICATE_API}/models/{model_id}/predictions",
-        headers=headers,
+        headers={**headers, "Prefer": f"wait={_CREATE_WAIT_SECS}"},
         json={"input": input_params},
-        timeout=30,
+        timeout=_CREATE_WAIT_SECS + 30,
     )
     if resp.status_code not in (200, 201):
         raise RuntimeError(f"Replicate start failed: {resp.text}")
-    prediction = resp.json()
-    pred_id = prediction["id"]
+    data = resp.json()
+    pred_id = data["id"]
     entry["provider_request_id"] = pred_id
     entry["status"] = "polling"
 
     poll_url = f"{REPLICATE_API}/predictions/{pred_id}"
     deadline = time.time() + 600
-    while time.time() < deadline:
-        r = await client.get(poll_url, headers=headers, timeout=30)
-        data = r.json()
+    delay = POLL_INITIAL_DELAY
+    while True:
         status = data.get("status", "")
         if status == "succeeded":
             output = data.get("output")
@@ -194,7 +198,12 @@ async def generate(prompt: str, params: dict, client: httpx.AsyncClient) -> str:
             raise RuntimeError(
                 f"Replicate {status}: {err}"
             )
-        await asyncio.sleep(5)
+        if time.time() >= deadline:
+            break
+        await asyncio.sleep(delay)
+        delay = next_poll_delay(delay)
+        r = await client.get(poll_url, headers=headers, timeout=30)
+        data = r.json()
     raise RuntimeError(f"Replicate generation timed out after 600s (prediction {pred_id})")
 
 
@@ -208,8 +217,11 @@ async def _poll_prediction(
     """Poll a Replicate prediction until it completes. Returns the output."""
     poll_url = f"{REPLICATE_API}/predictions/{pred_id}"
     deadline = time.time() + timeout_secs
+    delay = POLL_INITIAL_DELAY
 
     while time.time() < deadline:
+        await asyncio.sleep(delay)
+        delay = next_poll_delay(delay)
         r = await client.get(poll_url, headers=headers, timeout=30)
         data = r.json()
         status = data.get("status", "")
@@ -219,7 +231,6 @@ async def _poll_prediction(
             raise RuntimeError(
                 f"Replicate {label} {status}: {data.get('error', 'unknown')}"
             )
-        await asyncio.sleep(3)
 
     raise RuntimeError(f"Replicate {label} timed out after {timeout_secs}s")
 
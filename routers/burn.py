@@ -6,9 +6,9 @@ All endpoints are project-scoped via `project` query param.
 
 import asyncio
 import base64
+import collections
 import json as _json
 import logging
-import math
 import os
 import shutil
 import tempfile
@@ -29,7 +29,15 @@ from project_manager import (
     sanitize_project_name,
 )
 from services.captions import scan_project_captions
-from services.ffmpeg import TIKTOK_ENCODE_ARGS, build_cc_filter
+from services.ffmpeg import (
+    OPENCL_INPUT_ARGS,
+    TIKTOK_ENCODE_ARGS,
+    TIKTOK_FAST_ENCODE_ARGS,
+    build_cc_chain,
+    build_cc_filter,
+    is_default_cc,
+    opencl_available,
+)
 
 log = logging.getLogger("burn")
 
@@ -40,6 +48,11 @@ FONT_DIR = BASE_DIR / "fonts"
 # Limit concurrent ffmpeg burn processes to avoid resource exhaustion
 _burn_semaphore = asyncio.Semaphore(4)
 
+# Overlay PNGs (1-5 MB each) are written once and read once by ffmpeg, so
+# stage them on RAM-backed tmpfs when the host has one instead of /tmp,
+# which is a real disk on most containers. None → tempfile's default dir.
+_TMPDIR = "/dev/shm" if Path("/dev/shm").is_dir() and os.access("/dev/shm", os.W_OK) else None
+
 
 def _make_batch_id(project: str, burn_dir: Path, label: str | None = None) -> str:
     """Generate a systematic batch ID: {project}-{MMDDHHmm}-{run}.
@@ -79,6 +92,84 @@ def _load_batch_meta(batch_dir: Path) -> dict | None:
     return None
 
 
+# Append-only index of burn batches so GET /batches is one file read instead
+# of a stat + glob per batch directory. One JSON record per line; a later
+# record for the same id supersedes earlier ones. Batches append when they
+# start, finish and get renamed, and readers compact the file back to one
+# line per live batch.
+_BATCH_INDEX = ".batches_index.jsonl"
+
+
+def _batch_record(batch_dir: Path) -> dict:
+    meta = _load_batch_meta(batch_dir)
+    return {
+        "id": batch_dir.name,
+        "label": meta.get("label") if meta else None,
+        "count": sum(1 for _ in batch_dir.glob("burned_*.mp4")),
+        "created": int(batch_dir.stat().st_mtime),
+    }
+
+
+def _write_batch_index(burn_dir: Path, records: dict[str, dict]) -> None:
+    tmp = burn_dir / f"{_BATCH_INDEX}.tmp"
+    tmp.write_text("".join(_json.dumps(r) + "\n" for r in records.values()), encoding="utf-8")
+    tmp.replace(burn_dir / _BATCH_INDEX)
+
+
+def _rebuild_batch_index(burn_dir: Path) -> dict[str, dict]:
+    """Scan every batch directory once and rewrite the index from scratch."""
+    records = {d.name: _batch_record(d) for d in burn_dir.iterdir() if d.is_dir()}
+    _write_batch_index(burn_dir, records)
+    return records
+
+
+def _read_batch_index(burn_dir: Path) -> dict[str, dict] | None:
+    """Load the batch index as {batch_id: record}, or None if it doesn't exist yet.
+
+    Drops batches whose directory was removed outside the API, and rewrites
+    the file whenever it holds superseded, stale or unreadable lines.
+    """
+    try:
+        lines = (burn_dir / _BATCH_INDEX).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return None
+    records: dict[str, dict] = {}
+    for line in lines:
+        try:
+            record = _json.loads(line)
+            records[record["id"]] = record
+        except (_json.JSONDecodeError, KeyError, TypeError):
+            continue
+
+    # One directory read, not a stat per batch
+    with os.scandir(burn_dir) as it:
+        on_disk = {e.name for e in it if e.is_dir()}
+    live = {bid: r for bid, r in records.items() if bid in on_disk}
+    if len(live) != len(lines):
+        try:
+            _write_batch_index(burn_dir, live)
+        except OSError as e:
+            log.warning("batch index compaction failed for %s: %s", burn_dir, e)
+    return live
+
+
+def _record_batch(batch_dir: Path) -> None:
+    """Append a batch's current count/label/mtime to its burn dir's index.
+
+    If the index doesn't exist yet, build it from a full scan instead so
+    batches created before the index existed aren't dropped.
+    """
+    burn_dir = batch_dir.parent
+    try:
+        if not (burn_dir / _BATCH_INDEX).exists():
+            _rebuild_batch_index(burn_dir)
+            return
+        with open(burn_dir / _BATCH_INDEX, "a", encoding="utf-8") as f:
+            f.write(_json.dumps(_batch_record(batch_dir)) + "\n")
+    except OSError as e:
+        log.warning("batch index update failed for %s: %s", batch_dir, e)
+
+
 # ── Helpers ──────────────────────────────────────────────────────────
 
 
@@ -189,222 +280,201 @@ def _list_fonts() -> list[dict]:
 # ── FFmpeg Pipeline (preserved exactly from burn_server.py) ──────────
 
 
-def _build_filter_complex(color_correction: dict | None = None) -> str:
+def _build_filter_complex(
+    color_correction: dict | None = None,
+    needs_scale: bool = True,
+    opencl: bool = False,
+    idx: int | None = None,
+) -> str:
     """Build ffmpeg filter_complex that replicates CSS filter behavior.
 
     All color transforms are composed into a SINGLE colorchannelmixer filter
     to avoid multiple YUV<>RGB conversions that degrade video quality.
     Each CSS filter (brightness, contrast, saturate, sepia, hue-rotate) is
     a linear per-pixel transform expressible as a 3x3 matrix + offset.
-    We pre-multiply them into one combined matrix.
-    """
-    if not color_correction:
-        return "[0:v]scale=1080:1920:flags=lanczos,setsar=1[vid];[1:v]scale=1080:1920:flags=lanczos[ovr];[vid][ovr]overlay=0:0"
-
-    # Raw slider integers
-    b_raw = float(color_correction.get("brightness", 0))
-    c_raw = float(color_correction.get("contrast", 0))
-    s_raw = float(color_correction.get("saturation", 0))
-    sh_raw = float(color_correction.get("sharpness", 0))
-    sd_raw = float(color_correction.get("shadow", 0))
-    t_raw = float(color_correction.get("temperature", 0))
-    ti_raw = float(color_correction.get("tint", 0))
-    f_raw = float(color_correction.get("fade", 0))
-
-    # Map to CSS-equivalent values
-    css_brightness = 1 + b_raw / 100
-    css_contrast = 1 + c_raw / 100
-    css_saturate = 1 + s_raw / 100
-
-    if f_raw > 0:
-        fade = f_raw / 100
-        css_brightness = min(2.0, css_brightness + fade * 0.4)
-        css_contrast = max(0.2, css_contrast - fade * 0.3)
-        css_saturate = max(0.2, css_saturate - fade * 0.4)
-
-    if sd_raw != 0:
-        css_brightness += sd_raw / 400
-
-    sharpness = sh_raw / 50
-
-    is_default = (
-        abs(css_brightness - 1.0) < 0.005
-        and abs(css_contrast - 1.0) < 0.005
-        and abs(css_saturate - 1.0) < 0.005
-        and abs(t_raw) <= 1
-        and abs(ti_raw) <= 1
-        and sharpness < 0.001
-    )
-    if is_default:
-        return "[0:v]scale=1080:1920:flags=lanczos,setsar=1[vid];[1:v]scale=1080:1920:flags=lanczos[ovr];[vid][ovr]overlay=0:0"
-
-    # --- Compose all transforms into one 3x3 matrix + offset ---
-    mat = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
-    off = [0.0, 0.0, 0.0]
+    We pre-multiply them into one combined matrix (services.ffmpeg.build_cc_chain).
 
-    def mat_mul(a: list, b: list) -> list:
-        return [
-            [sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)]
-            for i in range(3)
-        ]
+    needs_scale=False drops the video's Lanczos rescale (the most expensive
+    filter in the chain) when the source is already 1080x1920. setsar=1 stays
+    either way, so non-square-pixel sources keep the same display aspect.
 
-    def mat_vec(m: list, v: list) -> list:
-        return [sum(m[i][j] * v[j] for j in range(3)) for i in range(3)]
-
-    # CSS brightness(b): out = in * b
-    if abs(css_brightness - 1.0) >= 0.005:
-        b = css_brightness
-        mat = [[b * mat[i][j] for j in range(3)] for i in range(3)]
-        off = [b * o for o in off]
-
-    # CSS contrast(c): out = (in - 0.5) * c + 0.5 = in*c + 0.5*(1-c)
-    if abs(css_contrast - 1.0) >= 0.005:
-        c = css_contrast
-        bias = 0.5 * (1 - c)
-        mat = [[c * mat[i][j] for j in range(3)] for i in range(3)]
-        off = [c * o + bias for o in off]
-
-    # CSS saturate(s): BT.709 saturation matrix
-    if abs(css_saturate - 1.0) >= 0.005:
-        s = css_saturate
-        sr, sg, sb = 0.2126, 0.7152, 0.0722
-        sat_mat = [
-            [sr + (1 - sr) * s, sg - sg * s, sb - sb * s],
-            [sr - sr * s, sg + (1 - sg) * s, sb - sb * s],
-            [sr - sr * s, sg - sg * s, sb + (1 - sb) * s],
-        ]
-        off = mat_vec(sat_mat, off)
-        mat = mat_mul(sat_mat, mat)
-
-    # Temperature: warm = CSS sepia(), cool = CSS hue-rotate(negative deg)
-    if abs(t_raw) > 1:
-        if t_raw > 0:
-            amt = min(1.0, t_raw / 200)
-            t_mat = [
-                [1 - amt + amt * 0.393, amt * 0.769, amt * 0.189],
-                [amt * 0.349, 1 - amt + amt * 0.686, amt * 0.168],
-                [amt * 0.272, amt * 0.534, 1 - amt + amt * 0.131],
-            ]
-        else:
-            rad = math.radians(t_raw / 5)
-            cos_a, sin_a = math.cos(rad), math.sin(rad)
-            t_mat = [
-                [
-                    0.213 + 0.787 * cos_a - 0.213 * sin_a,
-                    0.715 - 0.715 * cos_a - 0.715 * sin_a,
-                    0.072 - 0.072 * cos_a + 0.928 * sin_a,
-                ],
-                [
-                    0.213 - 0.213 * cos_a + 0.143 * sin_a,
-                    0.715 + 0.285 * cos_a + 0.140 * sin_a,
-                    0.072 - 0.072 * cos_a - 0.283 * sin_a,
-                ],
-                [
-                    0.213 - 0.213 * cos_a - 0.787 * sin_a,
-                    0.715 - 0.715 * cos_a + 0.715 * sin_a,
-                    0.072 + 0.928 * cos_a + 0.072 * sin_a,
-                ],
-            ]
-        off = mat_vec(t_mat, off)
-        mat = mat_mul(t_mat, mat)
-
-    # Tint: CSS hue-rotate
-    if abs(ti_raw) > 1:
-        rad = math.radians(ti_raw / 3)
-        cos_a, sin_a = math.cos(rad), math.sin(rad)
-        ti_mat = [
-            [
-                0.213 + 0.787 * cos_a - 0.213 * sin_a,
-                0.715 - 0.715 * cos_a - 0.715 * sin_a,
-                0.072 - 0.072 * cos_a + 0.928 * sin_a,
-            ],
-            [
-                0.213 - 0.213 * cos_a + 0.143 * sin_a,
-                0.715 + 0.285 * cos_a + 0.140 * sin_a,
-                0.072 - 0.072 * cos_a - 0.283 * sin_a,
-            ],
-            [
-                0.213 - 0.213 * cos_a - 0.787 * sin_a,
-                0.715 - 0.715 * cos_a + 0.715 * sin_a,
-                0.072 + 0.928 * cos_a + 0.072 * sin_a,
-            ],
-        ]
-        off = mat_vec(ti_mat, off)
-        mat = mat_mul(ti_mat, mat)
-
-    # --- Build filter string ---
-    ccm = (
-        f"colorchannelmixer="
-        f"rr={mat[0][0]:.6f}:rg={mat[0][1]:.6f}:rb={mat[0][2]:.6f}:ra={off[0]:.6f}:"
-        f"gr={mat[1][0]:.6f}:gg={mat[1][1]:.6f}:gb={mat[1][2]:.6f}:ga={off[1]:.6f}:"
-        f"br={mat[2][0]:.6f}:bg={mat[2][1]:.6f}:bb={mat[2][2]:.6f}:ba={off[2]:.6f}"
-    )
+    opencl=True composites on the GPU with overlay_opencl (the command must
+    include OPENCL_INPUT_ARGS). Color correction still runs on the CPU first.
 
-    filters = ["format=rgb24", ccm]
-
-    if sharpness >= 0.001:
-        filters.append(f"unsharp=5:5:{sharpness:.2f}:5:5:{sharpness:.2f}")
+    idx builds one branch of a multi-output graph: inputs 2*idx (video) and
+    2*idx+1 (overlay), output pad [out{idx}]. None → inputs 0/1, unlabeled output.
+    """
+    if idx is None:
+        main, over, vid, ovr, out = "[0:v]", "[1:v]", "[vid]", "[ovr]", ""
+    else:
+        main, over = f"[{2 * idx}:v]", f"[{2 * idx + 1}:v]"
+        vid, ovr, out = f"[vid{idx}]", f"[ovr{idx}]", f"[out{idx}]"
+
+    filters = build_cc_chain(color_correction)
+    filters.append("scale=1080:1920:flags=lanczos,setsar=1" if needs_scale else "setsar=1")
+
+    if opencl:
+        filters += ["format=yuv420p", "hwupload"]
+        return (
+            f"{main}{','.join(filters)}{vid};"
+            f"{over}scale=1080:1920:flags=lanczos,format=yuva420p,hwupload{ovr};"
+            f"{vid}{ovr}overlay_opencl=0:0,hwdownload,format=yuv420p{out}"
+        )
 
     chain = ",".join(filters)
-    return f"[0:v]{chain},scale=1080:1920:flags=lanczos,setsar=1[corrected];[1:v]scale=1080:1920:flags=lanczos[ovr];[corrected][ovr]overlay=0:0"
+    return f"{main}{chain}{vid};{over}scale=1080:1920:flags=lanczos{ovr};{vid}{ovr}overlay=0:0{out}"
 
 
-def _build_color_only_filter(color_correction: dict | None) -> str:
+def _build_color_only_filter(color_correction: dict | None, needs_scale: bool = True) -> str:
     """Build a -vf filter string for color correction only (no overlay input).
 
     Thin wrapper around services.ffmpeg.build_cc_filter that keeps burn's
     1080×1920 TikTok scale as the default. See services/ffmpeg.py for the
     full color-matrix implementation.
     """
-    return build_cc_filter(color_correction, scale="1080:1920")
+    if needs_scale:
+        return build_cc_filter(color_correction, scale="1080:1920")
+    # Already 1080x1920: skip the rescale but still reset the pixel aspect
+    return ",".join([*build_cc_chain(color_correction), "setsar=1"])
+
+
+# Probed (width, height) keyed by (path, mtime_ns) so a replaced file is re-probed.
+# LRU-bounded: a long-running server would otherwise keep every source it ever burned.
+_DIMS_CACHE_MAX = 512
+_dims_cache: collections.OrderedDict[tuple[str, int], tuple[int, int] | None] = (
+    collections.OrderedDict()
+)
+
+
+async def _probe_dims(video_path: str) -> tuple[int, int] | None:
+    """Return the first video stream's (width, height), or None if ffprobe fails."""
+    try:
+        key = (video_path, os.stat(video_path).st_mtime_ns)
+    except OSError:
+        return None
+    if key in _dims_cache:
+        _dims_cache.move_to_end(key)
+        return _dims_cache[key]
+
+    dims = None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffprobe", "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height",
+            "-of", "csv=p=0",
+            video_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await proc.communicate()
+        if proc.returncode == 0:
+            w, h = out.decode().strip().split(",")[:2]
+            dims = (int(w), int(h))
+    except (OSError, ValueError) as e:
+        log.warning("ffprobe dims failed for %s: %s", video_path, e)
+
+    _dims_cache[key] = dims
+    if len(_dims_cache) > _DIMS_CACHE_MAX:
+        _dims_cache.popitem(last=False)
+    return dims
+
+
+def _decode_overlay_png(overlay_png_b64: str) -> bytes:
+    """Decode a browser-rendered overlay PNG (base64, optional data-URL prefix).
+
+    Pure C work that releases the GIL, so callers run it via asyncio.to_thread.
+    """
+    # Strip data URL prefix if present (e.g. "data:image/png;base64,...")
+    if "," in overlay_png_b64:
+        overlay_png_b64 = overlay_png_b64.split(",", 1)[1]
+    # Guard against OOM from oversized payloads (50MB base64 ≈ 37.5MB decoded)
+    if len(overlay_png_b64) > 50_000_000:
+        raise ValueError("Overlay PNG too large (>50MB base64). Reduce overlay resolution.")
+    return base64.b64decode(overlay_png_b64)
+
+
+def _write_overlay_png(png_bytes: bytes) -> str:
+    """Write overlay PNG bytes to a temp file and return its path."""
+    fd, overlay_path = tempfile.mkstemp(suffix=".png", dir=_TMPDIR)
+    try:
+        os.write(fd, png_bytes)
+    finally:
+        os.close(fd)
+    return overlay_path
+
+
+def _encode_args(color_correction: dict | None, speed_priority: bool) -> list[str]:
+    if speed_priority and is_default_cc(color_correction):
+        return TIKTOK_FAST_ENCODE_ARGS
+    return TIKTOK_ENCODE_ARGS
+
+
+async def _run_ffmpeg(cmd: list[str]) -> None:
+    """Run an ffmpeg command, raising RuntimeError with the stderr tail on failure."""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    # Drain stderr as it arrives but only keep the tail — a long encode
+    # emits megabytes of progress output and we only report the end of it.
+    # Read fixed-size chunks rather than lines: ffmpeg separates progress
+    # updates with \r, so a "line" can grow past the StreamReader limit.
+    stderr_tail: collections.deque[bytes] = collections.deque(maxlen=50)
+    while chunk := await proc.stderr.read(1024):
+        stderr_tail.append(chunk)
+    await proc.wait()
+
+    if proc.returncode != 0:
+        raise RuntimeError(b"".join(stderr_tail).decode(errors="replace")[-2000:])
 
 
 async def _burn_video(
     video_path: str,
-    overlay_png_b64: str | None,
+    overlay_png: bytes | None,
     output_path: str,
     color_correction: dict | None = None,
+    speed_priority: bool = False,
 ) -> str:
     """Burn overlay onto video using a browser-rendered PNG + ffmpeg color correction.
 
-    overlay_png_b64: base64-encoded PNG from browser canvas (text overlay at full video res).
-                     If None/empty, only color correction is applied.
+    overlay_png: decoded PNG bytes from browser canvas (text overlay at full video res).
+                 If None/empty, only color correction is applied.
+    speed_priority: when True and no color correction is active, encode with
+                    TIKTOK_FAST_ENCODE_ARGS (ultrafast preset) instead of the
+                    default medium preset — roughly half the CPU for a somewhat
+                    larger file.
     """
     overlay_path = None
 
     try:
         # Write browser-rendered overlay PNG to temp file
-        if overlay_png_b64:
-            # Strip data URL prefix if present (e.g. "data:image/png;base64,...")
-            if "," in overlay_png_b64:
-                overlay_png_b64 = overlay_png_b64.split(",", 1)[1]
-            # Guard against OOM from oversized payloads (50MB base64 ≈ 37.5MB decoded)
-            if len(overlay_png_b64) > 50_000_000:
-                raise ValueError("Overlay PNG too large (>50MB base64). Reduce overlay resolution.")
-            png_bytes = base64.b64decode(overlay_png_b64)
-            fd, overlay_path = tempfile.mkstemp(suffix=".png")
-            os.write(fd, png_bytes)
-            os.close(fd)
-
-        filter_complex = _build_filter_complex(color_correction)
+        if overlay_png:
+            overlay_path = _write_overlay_png(overlay_png)
+
+        needs_scale = await _probe_dims(video_path) != (1080, 1920)
+        encode_args = _encode_args(color_correction, speed_priority)
 
         if overlay_path:
             # Have overlay — use it
+            use_opencl = await opencl_available()
             cmd = [
                 "ffmpeg",
                 "-y",
+                *(OPENCL_INPUT_ARGS if use_opencl else []),
                 "-i",
                 video_path,
                 "-i",
                 overlay_path,
                 "-filter_complex",
-                filter_complex,
-                *TIKTOK_ENCODE_ARGS,
+                _build_filter_complex(color_correction, needs_scale, use_opencl),
+                *encode_args,
                 output_path,
             ]
         else:
             # No overlay — just apply color correction to the video directly
-            cc_filter = _build_color_only_filter(color_correction)
+            cc_filter = _build_color_only_filter(color_correction, needs_scale)
             cmd = [
                 "ffmpeg",
                 "-y",
@@ -412,20 +482,11 @@ async def _burn_video(
                 video_path,
                 "-vf",
                 cc_filter,
-                *TIKTOK_ENCODE_ARGS,
+                *encode_args,
                 output_path,
             ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
-
-        if proc.returncode != 0:
-            raise RuntimeError(stderr.decode()[-2000:])
-
+        await _run_ffmpeg(cmd)
         return output_path
 
     finally:
@@ -433,6 +494,66 @@ async def _burn_video(
             os.unlink(overlay_path)
 
 
+# Max video+overlay pairs sharing one ffmpeg process. Each pair is decoded
+# and encoded concurrently inside that process, so this also bounds RAM.
+_BURN_GROUP_MAX = 6
+
+
+async def _burn_video_group(
+    items: list[tuple[str, bytes, str]],
+    color_correction: dict | None = None,
+    speed_priority: bool = False,
+) -> None:
+    """Burn several (video_path, overlay_png, output_path) items in ONE ffmpeg run.
+
+    All items share the same color correction, so a single process with N
+    input pairs and N outputs pays codec init / filter-graph parse once for
+    the whole group instead of once per video.
+    """
+    overlay_paths: list[str] = []
+    try:
+        for _, overlay_png, _ in items:
+            overlay_paths.append(_write_overlay_png(overlay_png))
+
+        use_opencl = await opencl_available()
+        encode_args = _encode_args(color_correction, speed_priority)
+
+        inputs: list[str] = []
+        graphs: list[str] = []
+        outputs: list[str] = []
+        for k, ((video_path, _, output_path), overlay_path) in enumerate(zip(items, overlay_paths)):
+            needs_scale = await _probe_dims(video_path) != (1080, 1920)
+            inputs += ["-i", video_path, "-i", overlay_path]
+            graphs.append(_build_filter_complex(color_correction, needs_scale, use_opencl, idx=k))
+            outputs += ["-map", f"[out{k}]", "-map", f"{2 * k}:a?", *encode_args, output_path]
+
+        cmd = [
+            "ffmpeg",
+            "-y",
+            *(OPENCL_INPUT_ARGS if use_opencl else []),
+            *inputs,
+            "-filter_complex",
+            ";".join(graphs),
+            *outputs,
+        ]
+        await _run_ffmpeg(cmd)
+
+    finally:
+        for path in overlay_paths:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+async def _is_complete_output(path: str) -> bool:
+    """True if path is a non-empty video ffprobe can read, not a cut-off write."""
+    try:
+        if os.path.getsize(path) == 0:
+            return False
+    except OSError:
+        return False
+    return await _probe_dims(path) is not None
+
+
 # ── API Routes ───────────────────────────────────────────────────────
 
 
@@ -474,13 +595,15 @@ async def _burn_background(
     mp4_path: str,
     color_correction: dict | None,
     video_rel: str,
+    speed_priority: bool = False,
 ) -> None:
     """Run a single burn in the background, updating _burn_jobs status."""
     _burn_jobs.setdefault(batch_id, {})[idx] = {"status": "burning"}
     try:
         if overlay_b64 or color_correction:
+            overlay_png = await asyncio.to_thread(_decode_overlay_png, overlay_b64) if overlay_b64 else None
             async with _burn_semaphore:
-                await _burn_video(video_abs, overlay_b64, mp4_path, color_correction)
+                await _burn_video(video_abs, overlay_png, mp4_path, color_correction, speed_priority)
         else:
             shutil.copy2(video_abs, mp4_path)
 
@@ -500,6 +623,12 @@ async def _burn_background(
             "ok": False,
             "error": str(e)[:2000],
         }
+    finally:
+        # Index once the batch goes idle, not once per burned file
+        if not any(
+            v["status"] in ("queued", "burning") for v in _burn_jobs[batch_id].values()
+        ):
+            _record_batch(Path(mp4_path).parent)
 
 
 @router.post("/overlay")
@@ -521,6 +650,7 @@ async def burn_overlay(request: Request):
     video_rel = body["videoPath"]
     overlay_b64 = body.get("overlayPng")
     color_correction = body.get("colorCorrection")
+    speed_priority = bool(body.get("speedPriority"))
 
     log.info("overlay #%d project=%s batch=%s video=%s overlay=%s cc=%s", idx, project, batch_id, video_rel, 'yes' if overlay_b64 else 'no', 'yes' if color_correction else 'no')
 
@@ -548,10 +678,15 @@ async def burn_overlay(request: Request):
 
         mp4_path = str(batch_dir / f"burned_{idx:03d}.mp4")
 
+        if batch_id not in _burn_jobs:
+            _record_batch(batch_dir)
+
         # Track as queued and fire background task
         _burn_jobs.setdefault(batch_id, {})[idx] = {"status": "queued"}
         asyncio.create_task(
-            _burn_background(batch_id, idx, video_abs, overlay_b64, mp4_path, color_correction, video_rel)
+            _burn_background(
+                batch_id, idx, video_abs, overlay_b64, mp4_path, color_correction, video_rel, speed_priority
+            )
         )
 
         return {"index": idx, "ok": True, "status": "queued"}
@@ -595,26 +730,24 @@ async def list_batches(project: str = Query(..., description="Project name")):
     except ValueError as e:
         return JSONResponse({"error": str(e)}, status_code=400)
 
-    batches = []
     if not burn_dir.exists():
-        return {"batches": batches}
+        return {"batches": []}
 
-    for d in sorted(burn_dir.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True):
-        if not d.is_dir():
-            continue
-        mp4s = list(d.glob("burned_*.mp4"))
-        if not mp4s:
-            continue
-        meta = _load_batch_meta(d)
-        batches.append(
-            {
-                "id": d.name,
-                "label": meta.get("label") if meta else None,
-                "count": len(mp4s),
-                "created": int(d.stat().st_mtime),
-            }
-        )
-    return {"batches": batches}
+    index = _read_batch_index(burn_dir)
+    if index is None:
+        index = _rebuild_batch_index(burn_dir)
+
+    batches = sorted(
+        (r for r in index.values() if r.get("count")),
+        key=lambda r: r.get("created", 0),
+        reverse=True,
+    )
+    return {
+        "batches": [
+            {"id": r["id"], "label": r.get("label"), "count": r["count"], "created": r.get("created", 0)}
+            for r in batches
+        ]
+    }
 
 
 @router.patch("/batches/{batch_id}/rename")
@@ -639,6 +772,7 @@ async def rename_batch(
     meta = _load_batch_meta(batch_dir) or {"batch_id": batch_id, "project": project}
     meta["label"] = new_label
     _save_batch_meta(batch_dir, meta)
+    _record_batch(batch_dir)
     return {"ok": True, "label": new_label}
 
 
@@ -850,7 +984,8 @@ async def ws_burn(ws: WebSocket):
       {
         "project": "project-name",
         "pairs": [
-          {"videoPath": "rel/path.mp4", "overlayPng": "base64...", "colorCorrection": {...}},
+          {"videoPath": "rel/path.mp4", "overlayPng": "base64...", "colorCorrection": {...},
+           "speedPriority": false},
           ...
         ]
       }
@@ -883,6 +1018,9 @@ async def ws_burn(ws: WebSocket):
             "created": datetime.now().isoformat(),
             "total": len(pairs),
         })
+        # Index the batch now; the finally below refreshes its count on every
+        # exit path, so a batch cut short by a disconnect still lists.
+        _record_batch(batch_dir)
 
         total = len(pairs)
         results = []
@@ -900,6 +1038,21 @@ async def ws_burn(ws: WebSocket):
 
         project_root = (PROJECTS_DIR / sanitize_project_name(project)).resolve()
 
+        # Decode every overlay PNG up front, in parallel — b64decode releases
+        # the GIL, so N decodes spread across the default thread pool.
+        async def _decode(b64: str | None) -> bytes | None:
+            return await asyncio.to_thread(_decode_overlay_png, b64) if b64 else None
+
+        overlays = await asyncio.gather(
+            *(_decode(pair.pop("overlayPng", None)) for pair in pairs),
+            return_exceptions=True,
+        )
+
+        # Resolve + validate every pair up front, then bucket the overlay burns
+        # by (color correction, speed) so each bucket runs as one multi-output
+        # ffmpeg process. Copy-only and color-only items run individually.
+        units: list[list[dict]] = []
+        groups: dict[str, list[dict]] = {}
         for i, pair in enumerate(pairs):
             vp = pair["videoPath"]
             # clips/ paths resolve from project root, regular paths from videos/
@@ -908,75 +1061,125 @@ async def ws_burn(ws: WebSocket):
                 video_abs = str(project_dir / vp)
             else:
                 video_abs = str(video_dir / vp)
-            overlay_png = pair.get("overlayPng")  # base64 PNG from browser canvas
-            color_correction = pair.get("colorCorrection")
             out_name = f"burned_{i:03d}.mp4"
-            out_path = str(batch_dir / out_name)
-
-            await ws.send_json(
-                {
-                    "event": "burning",
-                    "index": i,
-                    "total": total,
-                }
-            )
+            item = {
+                "index": i,
+                "video_abs": video_abs,
+                "overlay_png": overlays[i],  # decoded PNG from browser canvas
+                "color_correction": pair.get("colorCorrection"),
+                "speed_priority": bool(pair.get("speedPriority")),
+                "out_name": out_name,
+                "out_path": str(batch_dir / out_name),
+            }
 
             if not str(Path(video_abs).resolve()).startswith(str(project_root)):
                 log.error("burn ws: path traversal blocked for pair %d: %s", i, vp)
-                results.append(
-                    {
-                        "index": i,
-                        "ok": False,
-                        "error": "Invalid path",
-                    }
+                item["error"] = "Invalid path"
+                units.append([item])
+            elif isinstance(item["overlay_png"], Exception):
+                log.error("burn ws: bad overlay for pair %d: %s", i, item["overlay_png"])
+                item["error"] = str(item["overlay_png"])
+                units.append([item])
+            elif item["overlay_png"]:
+                key = _json.dumps(
+                    [item["color_correction"] or {}, item["speed_priority"]], sort_keys=True
                 )
-                await ws.send_json(
-                    {
-                        "event": "burned",
-                        "index": i,
-                        "total": total,
-                        "result": results[-1],
-                    }
-                )
-                continue
+                group = groups.get(key)
+                if group is None or len(group) >= _BURN_GROUP_MAX:
+                    group = groups[key] = []
+                    units.append(group)
+                group.append(item)
+            else:
+                units.append([item])
+
+        def _ok(item: dict) -> dict:
+            return {"index": item["index"], "ok": True, "file": f"{batch_id}/{item['out_name']}"}
+
+        def _failed(item: dict, error: str) -> dict:
+            return {"index": item["index"], "ok": False, "error": error[:2000]}
 
+        async def _burn_one(item: dict) -> dict:
             try:
-                if overlay_png or color_correction:
+                if item["overlay_png"] or item["color_correction"]:
                     await _burn_video(
-                        video_abs,
-                        overlay_png,
-                        out_path,
-                        color_correction,
+                        item["video_abs"],
+                        item["overlay_png"],
+                        item["out_path"],
+                        item["color_correction"],
+                        item["speed_priority"],
                     )
                 else:
-                    shutil.copy2(video_abs, out_path)
-
-                results.append(
-                    {
-                        "index": i,
-                        "ok": True,
-                        "file": f"{batch_id}/{out_name}",
-                    }
-                )
+                    shutil.copy2(item["video_abs"], item["out_path"])
+                return _ok(item)
             except Exception as e:
-                log.error("burn failed for pair %d: %s", i, e)
-                results.append(
+                log.error("burn failed for pair %d: %s", item["index"], e)
+                return _failed(item, str(e))
+
+        ready: dict[int, dict] = {}
+        next_index = 0
+        try:
+            for unit in units:
+                # A group is a single ffmpeg process, reported through its lead
+                # item; the others only get "burning" if retried on their own.
+                await ws.send_json(
                     {
-                        "index": i,
-                        "ok": False,
-                        "error": str(e)[:2000],
+                        "event": "burning",
+                        "index": unit[0]["index"],
+                        "total": total,
                     }
                 )
 
-            await ws.send_json(
-                {
-                    "event": "burned",
-                    "index": i,
-                    "total": total,
-                    "result": results[-1],
-                }
-            )
+                if "error" in unit[0]:
+                    unit_results = [_failed(unit[0], unit[0]["error"])]
+                elif len(unit) == 1:
+                    unit_results = [await _burn_one(unit[0])]
+                else:
+                    try:
+                        await _burn_video_group(
+                            [(it["video_abs"], it["overlay_png"], it["out_path"]) for it in unit],
+                            unit[0]["color_correction"],
+                            unit[0]["speed_priority"],
+                        )
+                        unit_results = [_ok(it) for it in unit]
+                    except Exception as e:
+                        # One bad input fails the whole process — retry the group
+                        # one by one so only the broken item reports an error.
+                        log.warning("group burn of %d failed, retrying individually: %s", len(unit), e)
+                        unit_results = []
+                        for it in unit:
+                            # Outputs the group process already finished stand
+                            if await _is_complete_output(it["out_path"]):
+                                unit_results.append(_ok(it))
+                                continue
+                            if it is not unit[0]:
+                                await ws.send_json(
+                                    {
+                                        "event": "burning",
+                                        "index": it["index"],
+                                        "total": total,
+                                    }
+                                )
+                            unit_results.append(await _burn_one(it))
+
+                results.extend(unit_results)
+                ready.update((r["index"], r) for r in unit_results)
+                # A group can finish items ahead of single units queued before
+                # them; hold results back so "burned" goes out in index order.
+                while next_index in ready:
+                    result = ready.pop(next_index)
+                    next_index += 1
+                    await ws.send_json(
+                        {
+                            "event": "burned",
+                            "index": result["index"],
+                            "total": total,
+                            "result": result,
+                        }
+                    )
+        finally:
+            _record_batch(batch_dir)
 
+        results.sort(key=lambda r: r["index"])
         keepalive_task.cancel()
 
         await ws.send_json(
@@ -36,8 +36,11 @@ async def _broadcast(job_id: str, event: str, data: dict):
         clients.remove(ws)
 
 
+_VIDEO_ID_RE = re.compile(r"/video/(\d+)")
+
+
 def _video_id(url: str) -> str:
-    m = re.search(r"/video/(\d+)", url)
+    m = _VIDEO_ID_RE.search(url)
     return m.group(1) if m else "unknown"
 
 
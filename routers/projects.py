@@ -1,11 +1,13 @@
 """Projects router for managing campaigns and workflows."""
 
+import asyncio
 import logging
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 
 from project_manager import (
@@ -28,42 +30,66 @@ class CreateProjectRequest(BaseModel):
     name: str
 
 
+# Stats walk every file in three directories and dashboards poll them. A cached
+# payload is reused while the three dir mtimes are unchanged (any create,
+# delete or rename bumps them) and it is younger than STATS_CACHE_TTL — the
+# TTL only bounds staleness from files growing in place.
+# sanitized name → (monotonic timestamp, dir mtimes, payload)
+STATS_CACHE_TTL = 30
+_STATS_SUBDIRS = ("videos", "captions", "burned")
+_stats_cache: dict[str, tuple[float, tuple, dict]] = {}
+
+
+def _stats_dir_mtimes(project_path: Path) -> tuple:
+    mtimes = []
+    for sub in _STATS_SUBDIRS:
+        try:
+            mtimes.append(os.stat(project_path / sub).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _invalidate_stats(name: str) -> None:
+    try:
+        _stats_cache.pop(sanitize_project_name(name), None)
+    except ValueError:
+        pass
+
+
 def _get_dir_stats(dir_path: Path) -> dict:
-    if not dir_path.exists():
-        return {"count": 0, "total_size_bytes": 0, "files": []}
+    """Count/size/list the files in dir_path.
+
+    Also returns "max_mtime" (newest file mtime, or None) so callers can derive
+    last activity from the same walk; strip it before returning to clients.
+    """
+    try:
+        it = os.scandir(dir_path)
+    except FileNotFoundError:
+        return {"count": 0, "total_size_bytes": 0, "files": [], "max_mtime": None}
 
     files = []
     total_size = 0
-    for f in sorted(dir_path.iterdir()):
-        if f.is_file():
-            stat = f.stat()
+    max_mtime = None
+    # Follow symlinks: legacy-imports projects are made entirely of them.
+    with it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
             total_size += stat.st_size
+            if max_mtime is None or stat.st_mtime > max_mtime:
+                max_mtime = stat.st_mtime
             files.append(
                 {
-                    "name": f.name,
+                    "name": entry.name,
                     "size_bytes": stat.st_size,
                     "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
                 }
             )
 
-    return {"count": len(files), "total_size_bytes": total_size, "files": files}
-
-
-def _get_last_activity(project_path: Path) -> str | None:
-    latest = None
-    for subdir_name in ("videos", "captions", "burned"):
-        subdir = project_path / subdir_name
-        if not subdir.exists():
-            continue
-        for f in subdir.iterdir():
-            if f.is_file():
-                mtime = f.stat().st_mtime
-                if latest is None or mtime > latest:
-                    latest = mtime
-
-    if latest is not None:
-        return datetime.fromtimestamp(latest).isoformat()
-    return None
+    files.sort(key=lambda f: f["name"])
+    return {"count": len(files), "total_size_bytes": total_size, "files": files, "max_mtime": max_mtime}
 
 
 @router.get("/")
@@ -90,6 +116,7 @@ async def create_new_project(body: CreateProjectRequest):
     except FileExistsError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
+    _invalidate_stats(body.name)
     project_info = get_project(body.name)
     return {"project": project_info}
 
@@ -116,6 +143,7 @@ async def delete_existing_project(name: str):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    _invalidate_stats(name)
     if not deleted:
         raise HTTPException(status_code=404, detail=f"Project '{name}' not found")
 
@@ -123,24 +151,48 @@ async def delete_existing_project(name: str):
 
 
 @router.get("/{name}/stats")
-async def get_project_stats(name: str):
-    """Get detailed stats for a project (file sizes, last activity)."""
+async def get_project_stats(name: str, response: Response):
+    """Get detailed stats for a project (file sizes, last activity).
+
+    Cached per project until a stats dir changes (or STATS_CACHE_TTL passes).
+    """
     try:
         sanitized = sanitize_project_name(name)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    response.headers["Cache-Control"] = f"max-age={STATS_CACHE_TTL}"
+
     project_path = PROJECTS_DIR / sanitized
+    mtimes = _stats_dir_mtimes(project_path)
+
+    cached = _stats_cache.get(sanitized)
+    if (
+        cached
+        and cached[1] == mtimes
+        and time.monotonic() - cached[0] < STATS_CACHE_TTL
+    ):
+        return cached[2]
 
     if not project_path.exists():
         raise HTTPException(status_code=404, detail=f"Project '{name}' not found")
 
-    videos_stats = _get_dir_stats(project_path / "videos")
-    captions_stats = _get_dir_stats(project_path / "captions")
-    burned_stats = _get_dir_stats(project_path / "burned")
-    last_activity = _get_last_activity(project_path)
+    # Independent directory walks — run them on worker threads, concurrently,
+    # so the event loop isn't blocked for their combined I/O time.
+    videos_stats, captions_stats, burned_stats = await asyncio.gather(
+        asyncio.to_thread(_get_dir_stats, project_path / "videos"),
+        asyncio.to_thread(_get_dir_stats, project_path / "captions"),
+        asyncio.to_thread(_get_dir_stats, project_path / "burned"),
+    )
+
+    # Last activity falls out of the same walks — no second pass over the dirs.
+    latest = max(
+        (m for m in (d.pop("max_mtime") for d in (videos_stats, captions_stats, burned_stats)) if m is not None),
+        default=None,
+    )
+    last_activity = datetime.fromtimestamp(latest).isoformat() if latest is not None else None
 
-    return {
+    stats = {
         "name": sanitized,
         "videos": videos_stats,
         "captions": captions_stats,
@@ -152,6 +204,8 @@ async def get_project_stats(name: str):
             + burned_stats["total_size_bytes"]
         ),
     }
+    _stats_cache[sanitized] = (time.monotonic(), mtimes, stats)
+    return stats
 
 
 LEGACY_PROJECT_NAME = "legacy-imports"
@@ -164,29 +218,56 @@ def _symlink_files(
     Recursively find files matching extensions in source_dir and create
     symlinks in target_dir. Returns list of created symlink names.
 
-    Uses absolute symlinks so they work regardless of cwd.
+    Uses absolute, canonical symlinks so they work regardless of cwd and a
+    link to a link points at the real file rather than chaining.
     Skips files that already have a symlink in target_dir.
     """
     created = []
     if not source_dir.exists():
         return created
 
-    for f in source_dir.rglob("*"):
-        if not f.is_file() or f.suffix.lower() not in extensions:
-            continue
-
-        relative = f.relative_to(source_dir)
-        flat_name = str(relative).replace(os.sep, "_")
-        link_path = target_dir / flat_name
-
-        if link_path.exists():
-            continue
-
+    # One listdir instead of an exists() syscall per candidate file.
+    existing = set(os.listdir(target_dir))
+    suffixes = tuple(ext.lower() for ext in extensions)
+    source = str(source_dir)
+    # Directory symlinks aren't followed below, so only the root and symlinked
+    # files need resolving; every other path is real_source + its suffix.
+    real_source = os.path.realpath(source)
+    target = str(target_dir)
+    stack = [source]
+    while stack:
         try:
-            link_path.symlink_to(f.resolve())
-            created.append(flat_name)
-        except OSError as e:
-            logger.warning("Failed to symlink %s -> %s: %s", f, link_path, e)
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                # Cheap name check first (lowercasing only the extension);
+                # is_file() may need a stat for symlinked entries.
+                name = entry.name
+                if not name[name.rfind(".") :].lower().endswith(suffixes):
+                    continue
+                if not entry.is_file():
+                    continue
+
+                flat_name = os.path.relpath(entry.path, source).replace(os.sep, "_")
+                if flat_name in existing:
+                    continue
+
+                link_path = os.path.join(target, flat_name)
+                try:
+                    if entry.is_symlink():
+                        real_path = os.path.realpath(entry.path)
+                    else:
+                        real_path = real_source + entry.path[len(source):]
+                    os.symlink(real_path, link_path)
+                    existing.add(flat_name)
+                    created.append(flat_name)
+                except OSError as e:
+                    logger.warning("Failed to symlink %s -> %s: %s", entry.path, link_path, e)
 
     return created
 
@@ -220,12 +301,17 @@ async def import_legacy_content():
     captions_dir = project_path / "captions"
     burned_dir = project_path / "burned"
 
-    video_links = _symlink_files(
-        BASE_DIR / "output", videos_dir, {".mp4", ".mov", ".webm"}
-    )
-    caption_links = _symlink_files(BASE_DIR / "caption_output", captions_dir, {".csv"})
-    burned_links = _symlink_files(
-        BASE_DIR / "burn_output", burned_dir, {".mp4", ".mov", ".webm"}
+    # Three independent trees: walk them concurrently, off the event loop.
+    video_links, caption_links, burned_links = await asyncio.gather(
+        asyncio.to_thread(
+            _symlink_files, BASE_DIR / "output", videos_dir, {".mp4", ".mov", ".webm"}
+        ),
+        asyncio.to_thread(
+            _symlink_files, BASE_DIR / "caption_output", captions_dir, {".csv"}
+        ),
+        asyncio.to_thread(
+            _symlink_files, BASE_DIR / "burn_output", burned_dir, {".mp4", ".mov", ".webm"}
+        ),
     )
 
     summary = {
@@ -1,7 +1,6 @@
 """Video generation router — migrated from server.py with project-scoped paths."""
 
 import asyncio
-import base64
 import io
 import json
 import logging
@@ -10,6 +9,7 @@ import re
 import tempfile
 import uuid
 import zipfile
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -17,8 +17,8 @@ from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 
 from project_manager import PROJECTS_DIR, get_project_video_dir
-from providers import PROVIDERS
-from providers.base import API_KEYS, generate_one
+from providers import PROVIDERS, available_providers
+from providers.base import API_KEYS, encode_data_uri, generate_one
 from services.ffmpeg import is_default_cc, run_color_correct
 
 log = logging.getLogger("video")
@@ -29,14 +29,31 @@ jobs: dict[str, dict] = {}
 
 MAX_PROMPT_HISTORY = 200
 
+# Finished jobs older than this are dropped from memory (they stay in the
+# project's jobs.json and are reloaded on demand).
+JOB_MEMORY_TTL_SECS = int(os.getenv("JOB_MEMORY_TTL_SECS", str(24 * 3600)))
+
+# project -> jobs in its jobs.json that aren't in ``jobs`` (pruned, or left
+# out as stale on load), so saves can rewrite the file without reading it.
+# A project with no entry hasn't been read yet.
+_disk_only_jobs: dict[str, dict[str, dict]] = {}
+
 # Limit concurrent video generation tasks to prevent resource exhaustion
 _gen_semaphore = asyncio.Semaphore(10)
 
+# Strong references to in-flight generation tasks. The event loop only keeps
+# weak refs, so an unreferenced task can be garbage-collected mid-poll.
+_gen_tasks: set[asyncio.Task] = set()
+
 # Cap concurrent color-correct ffmpeg encodes so a big bulk request can't
 # exhaust the host's CPU/IO. 4 is conservative and matches the burn router's
 # tolerance for parallel ffmpeg work.
 _cc_semaphore = asyncio.Semaphore(4)
 
+# Cap concurrent upload -> base64 encodes so a burst of large image uploads
+# can't balloon RSS.
+_encode_semaphore = asyncio.Semaphore(4)
+
 # Hard ceiling on a single bulk color-correct request — prevents a runaway
 # client from queueing thousands of encodes.
 _CC_BULK_MAX_ITEMS = 50
@@ -61,6 +78,13 @@ def _resolve_safe_video_path(project: str, path: str) -> Path:
     return target
 
 
+async def _upload_to_data_uri(upload: UploadFile) -> str:
+    """Base64 an upload's spooled file in a worker thread, off the event loop."""
+    ct = upload.content_type or "image/jpeg"
+    async with _encode_semaphore:
+        return await asyncio.to_thread(encode_data_uri, upload.file, ct)
+
+
 def _make_job_id(provider: str, prompt: str) -> str:
     """Generate a readable job ID: {provider}-{words}-{MMDDHHmm}-{short_uuid}.
 
@@ -82,12 +106,47 @@ def _jobs_path(project: str) -> Path:
     return PROJECTS_DIR / project / "jobs.json"
 
 
-def _save_jobs(project: str) -> None:
-    """Persist active jobs for this project to disk."""
-    project_jobs = {jid: j for jid, j in jobs.items() if j.get("project") == project}
-    if not project_jobs:
+def _disk_only(project: str) -> dict[str, dict] | None:
+    """This project's on-disk-only jobs, reading jobs.json the first time only.
+
+    Returns None if the file exists but can't be read.
+    """
+    cached = _disk_only_jobs.get(project)
+    if cached is not None:
+        return cached
+    p = _jobs_path(project)
+    data: dict[str, dict] = {}
+    if p.exists():
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            log.error("Failed to read jobs from %s: %s", p, e)
+            return None
+    cached = {jid: j for jid, j in data.items() if jid not in jobs}
+    _disk_only_jobs[project] = cached
+    return cached
+
+
+def _save_jobs(project: str, removed: frozenset[str] | set[str] = frozenset()) -> None:
+    """Persist this project's jobs to disk.
+
+    Jobs already on disk but not in memory (pruned, or not loaded since a
+    restart) are kept; ids in ``removed`` are dropped. If jobs.json can't be
+    read the save is skipped rather than overwriting it with a partial view.
+    """
+    disk_only = _disk_only(project)
+    if disk_only is None:
+        log.error("Not saving jobs for project %s: jobs.json is unreadable", project)
         return
+    for jid in removed:
+        disk_only.pop(jid, None)
+    project_jobs = dict(disk_only)
+    project_jobs.update(
+        (jid, j) for jid, j in jobs.items() if j.get("project") == project
+    )
     p = _jobs_path(project)
+    if not project_jobs and not removed:
+        return
     p.parent.mkdir(parents=True, exist_ok=True)
     try:
         p.write_text(json.dumps(project_jobs, indent=2), encoding="utf-8")
@@ -98,6 +157,38 @@ def _save_jobs(project: str) -> None:
 _TERMINAL_STATUSES = {"done", "error"}
 
 
+def _job_age_secs(job: dict) -> float | None:
+    created = job.get("created_at")
+    if not created:
+        return None
+    try:
+        created_dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return (datetime.now(timezone.utc) - created_dt).total_seconds()
+
+
+def _is_stale(job: dict) -> bool:
+    """Finished and older than JOB_MEMORY_TTL_SECS -- served from disk only."""
+    return (
+        all(v.get("status") in _TERMINAL_STATUSES for v in job.get("videos", []))
+        and (_job_age_secs(job) or 0) > JOB_MEMORY_TTL_SECS
+    )
+
+
+def _prune_jobs() -> None:
+    """Drop stale jobs from memory.
+
+    Safe because every finished job is already in its project's jobs.json
+    and _save_jobs keeps on-disk entries that aren't in memory.
+    """
+    for jid in [jid for jid, job in jobs.items() if _is_stale(job)]:
+        job = jobs.pop(jid)
+        disk_only = _disk_only_jobs.get(job.get("project", "quick-test"))
+        if disk_only is not None:
+            disk_only[jid] = job
+
+
 def _mark_entry_error(job_id: str, index: int, message: str) -> None:
     """Flip a video entry to 'error' if it hasn't already reached a terminal state.
 
@@ -121,34 +212,55 @@ def _mark_entry_error(job_id: str, index: int, message: str) -> None:
         log.exception("failed to persist job after marking error job=%s idx=%d", job_id, index)
 
 
-def _load_jobs(project: str) -> None:
+def _load_jobs(project: str, include_stale: bool = False) -> dict[str, dict]:
     """Load persisted jobs from disk into the in-memory dict.
 
     Videos stuck in non-terminal states (generating, downloading, cropping, polling)
     are marked as done-with-crops if crop files exist on disk, or as error otherwise.
     This handles server restarts that kill in-flight async tasks.
+
+    Stale jobs (see _is_stale) are left out of memory unless ``include_stale``;
+    every on-disk job is returned either way.
     """
     p = _jobs_path(project)
     if not p.exists():
-        return
+        return {}
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
-        for jid, job in data.items():
-            if jid not in jobs:
-                # Fix stuck videos from previous server session
-                for v in job.get("videos", []):
-                    if v.get("status") not in _TERMINAL_STATUSES:
-                        # Check if crop files landed on disk before the crash
-                        if v.get("crops"):
-                            v["status"] = "done"
-                        elif v.get("file"):
-                            v["status"] = "done"
-                        else:
-                            v["status"] = "error"
-                            v["error"] = "Server restarted during processing"
-                jobs[jid] = job
     except (json.JSONDecodeError, OSError) as e:
         log.error("Failed to load jobs from %s: %s", p, e)
+        return {}
+    for jid, job in data.items():
+        if jid in jobs:
+            continue
+        # Fix stuck videos from previous server session
+        for v in job.get("videos", []):
+            if v.get("status") not in _TERMINAL_STATUSES:
+                # Check if crop files landed on disk before the crash
+                if v.get("crops"):
+                    v["status"] = "done"
+                elif v.get("file"):
+                    v["status"] = "done"
+                else:
+                    v["status"] = "error"
+                    v["error"] = "Server restarted during processing"
+        if include_stale or not _is_stale(job):
+            jobs[jid] = job
+    _disk_only_jobs[project] = {jid: j for jid, j in data.items() if jid not in jobs}
+    return data
+
+
+def _find_job(job_id: str) -> dict | None:
+    """A job from memory, or from any project's jobs.json (stale jobs included)."""
+    job = jobs.get(job_id)
+    if job is not None:
+        return job
+    for proj_dir in PROJECTS_DIR.iterdir():
+        if proj_dir.is_dir():
+            job = _load_jobs(proj_dir.name).get(job_id)
+            if job is not None:
+                return job
+    return None
 
 
 def _persist_job(job_id: str) -> None:
@@ -180,17 +292,8 @@ def _save_prompt(project: str, entry: dict) -> None:
 
 
 @router.get("/providers")
-async def list_providers():
-    available = []
-    for pid, info in PROVIDERS.items():
-        if API_KEYS.get(info["key_id"]):
-            available.append(
-                {
-                    "id": pid,
-                    **{k: v for k, v in info.items() if k != "module"},
-                }
-            )
-    return available
+async def list_providers() -> list[dict]:
+    return available_providers()
 
 
 PROVIDER_SCHEMAS: dict[str, dict] = {
@@ -333,18 +436,12 @@ async def generate_video(
     duration = max(1, min(duration, 15))
 
     image_data_uri = None
-    if media and media.size and media.size > 0:
-        raw = await media.read()
-        b64 = base64.b64encode(raw).decode()
-        ct = media.content_type or "image/jpeg"
-        image_data_uri = f"data:{ct};base64,{b64}"
+    if media and media.size:
+        image_data_uri = await _upload_to_data_uri(media)
 
     last_image_data_uri = None
-    if last_image and last_image.size and last_image.size > 0:
-        raw = await last_image.read()
-        b64 = base64.b64encode(raw).decode()
-        ct = last_image.content_type or "image/jpeg"
-        last_image_data_uri = f"data:{ct};base64,{b64}"
+    if last_image and last_image.size:
+        last_image_data_uri = await _upload_to_data_uri(last_image)
 
     extra: dict = {}
     if last_image_data_uri:
@@ -443,6 +540,8 @@ async def generate_video(
 
     for i in range(count):
         t = asyncio.create_task(_throttled_generate(i))
+        _gen_tasks.add(t)
+        t.add_done_callback(_gen_tasks.discard)
         t.add_done_callback(_on_task_done(i))
 
     return {"job_id": job_id, "count": count}
@@ -462,15 +561,8 @@ def _sweep_stuck_entries(job: dict) -> None:
     Runs on every /jobs and /jobs/{id} poll. Idempotent — only touches entries
     still in a non-terminal state past the timeout.
     """
-    created = job.get("created_at")
-    if not created:
-        return
-    try:
-        created_dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-    except ValueError:
-        return
-    age = (datetime.now(timezone.utc) - created_dt).total_seconds()
-    if age < _STUCK_JOB_TIMEOUT_SECS:
+    age = _job_age_secs(job)
+    if age is None or age < _STUCK_JOB_TIMEOUT_SECS:
         return
     swept = False
     for entry in job.get("videos", []):
@@ -489,33 +581,36 @@ def _sweep_stuck_entries(job: dict) -> None:
             log.exception("failed to persist job after sweep job=%s", job.get("id"))
 
 
+# The return annotation lets FastAPI serialize straight to JSON bytes via
+# pydantic-core instead of going through jsonable_encoder first.
 @router.get("/jobs")
-async def list_jobs(project: str = "quick-test"):
-    _load_jobs(project)
-    project_jobs = [j for j in jobs.values() if j.get("project") == project]
-    for j in project_jobs:
-        _sweep_stuck_entries(j)
-    return project_jobs
+async def list_jobs(project: str = "quick-test") -> list[dict]:
+    # Stale jobs come straight from jobs.json without being re-inserted into
+    # memory, so frequent polling doesn't churn them in and out.
+    merged = _load_jobs(project)
+    for jid, j in jobs.items():
+        if j.get("project") == project:
+            _sweep_stuck_entries(j)
+            merged[jid] = j
+    _prune_jobs()
+    return list(merged.values())
 
 
 @router.get("/jobs/{job_id}")
-async def get_job(job_id: str):
-    if job_id not in jobs:
-        # Try loading from all projects
-        for proj_dir in PROJECTS_DIR.iterdir():
-            if proj_dir.is_dir():
-                _load_jobs(proj_dir.name)
-        if job_id not in jobs:
-            raise HTTPException(status_code=404, detail="Job not found")
-    _sweep_stuck_entries(jobs[job_id])
-    return jobs[job_id]
+async def get_job(job_id: str) -> dict:
+    job = _find_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    _sweep_stuck_entries(job)
+    _prune_jobs()
+    return job
 
 
 @router.delete("/jobs/{job_id}")
 async def delete_job(job_id: str, project: str = "quick-test"):
     """Delete a job and all its video files from disk."""
     if job_id not in jobs:
-        _load_jobs(project)
+        _load_jobs(project, include_stale=True)
     job = jobs.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -542,16 +637,47 @@ async def delete_job(job_id: str, project: str = "quick-test"):
 
     # Remove from in-memory state
     del jobs[job_id]
-    _save_jobs(proj)
+    _save_jobs(proj, removed={job_id})
 
     return {"deleted": True, "job_id": job_id, "files_removed": deleted_files}
 
 
+def _write_zip(zip_path: str, entries: list[tuple[Path, str]]) -> int:
+    """Store each existing (path, arcname) into a ZIP; returns files written.
+
+    ZIP_STORED: the videos are already compressed.
+    """
+    count = 0
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+        for filepath, arcname in entries:
+            if filepath.exists():
+                zf.write(filepath, arcname)
+                count += 1
+    return count
+
+
+def _iter_file_then_unlink(path: str) -> Iterator[bytes]:
+    """Yield a temp file in 1 MiB chunks, deleting it afterwards.
+
+    Sync on purpose: Starlette iterates it in the threadpool, so the reads
+    don't block the event loop.
+    """
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                yield chunk
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
 @router.get("/jobs/{job_id}/download-all")
 async def download_all(job_id: str):
-    if job_id not in jobs:
+    job = _find_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    job = jobs[job_id]
     done_videos = [
         v for v in job["videos"] if v.get("status") == "done" and v.get("file")
     ]
@@ -561,34 +687,24 @@ async def download_all(job_id: str):
     project = job.get("project", "quick-test")
     base_dir = get_project_video_dir(project)
 
+    # Prefer crops when present — each crop is a separate deliverable file,
+    # and v["file"] is just an alias for the first crop in multi-crop mode
+    # (set in providers/base.py). If we only zipped v["file"] we'd silently
+    # drop crops 2..N.
+    rels: list[str] = []
+    for v in done_videos:
+        crops = v.get("crops") or []
+        if crops:
+            rels.extend(crop["file"] for crop in crops if crop.get("file"))
+        else:
+            rels.append(v["file"])
+    entries = [(base_dir / rel, rel) for rel in dict.fromkeys(rels)]
+
     tmp_fd, tmp_path = tempfile.mkstemp(suffix=".zip")
     os.close(tmp_fd)
     try:
-        written: set[str] = set()
-        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as zf:
-            for v in done_videos:
-                # Prefer crops when present — each crop is a separate deliverable
-                # file, and v["file"] is just an alias for the first crop in
-                # multi-crop mode (set in providers/base.py). If we only zipped
-                # v["file"] we'd silently drop crops 2..N.
-                crops = v.get("crops") or []
-                if crops:
-                    for crop in crops:
-                        rel = crop.get("file")
-                        if not rel or rel in written:
-                            continue
-                        filepath = base_dir / rel
-                        if filepath.exists():
-                            zf.write(filepath, rel)
-                            written.add(rel)
-                else:
-                    rel = v["file"]
-                    if rel in written:
-                        continue
-                    filepath = base_dir / rel
-                    if filepath.exists():
-                        zf.write(filepath, rel)
-                        written.add(rel)
+        # Building the archive is all blocking file I/O; keep it off the loop.
+        await asyncio.to_thread(_write_zip, tmp_path, entries)
     except Exception:
         os.unlink(tmp_path)
         raise
@@ -596,19 +712,8 @@ async def download_all(job_id: str):
     zip_size = os.path.getsize(tmp_path)
     zip_name = f"videolab_{job_id}.zip"
 
-    async def _stream():
-        try:
-            with open(tmp_path, "rb") as f:
-                while chunk := f.read(1024 * 1024):
-                    yield chunk
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-
     return StreamingResponse(
-        _stream(),
+        _iter_file_then_unlink(tmp_path),
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="{zip_name}"',
@@ -628,32 +733,27 @@ async def bulk_download(body: dict):
     if not job_ids:
         raise HTTPException(status_code=400, detail="No job IDs provided")
 
-    _load_jobs(project)
+    _load_jobs(project, include_stale=True)
     base_dir = get_project_video_dir(project)
 
+    entries: list[tuple[Path, str]] = []
+    for jid in job_ids:
+        job = jobs.get(jid)
+        if not job:
+            continue
+        for v in job.get("videos", []):
+            if v.get("status") != "done":
+                continue
+            if v.get("file"):
+                entries.append((base_dir / v["file"], f"{jid}/{v['file']}"))
+            for crop in v.get("crops", []):
+                if crop.get("file"):
+                    entries.append((base_dir / crop["file"], f"{jid}/{crop['file']}"))
+
     tmp_fd, tmp_path = tempfile.mkstemp(suffix=".zip")
     os.close(tmp_fd)
-    file_count = 0
     try:
-        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as zf:
-            for jid in job_ids:
-                job = jobs.get(jid)
-                if not job:
-                    continue
-                for v in job.get("videos", []):
-                    if v.get("status") != "done":
-                        continue
-                    if v.get("file"):
-                        fp = base_dir / v["file"]
-                        if fp.exists():
-                            zf.write(fp, f"{jid}/{v['file']}")
-                            file_count += 1
-                    for crop in v.get("crops", []):
-                        if crop.get("file"):
-                            fp = base_dir / crop["file"]
-                            if fp.exists():
-                                zf.write(fp, f"{jid}/{crop['file']}")
-                                file_count += 1
+        file_count = await asyncio.to_thread(_write_zip, tmp_path, entries)
     except Exception:
         os.unlink(tmp_path)
         raise
@@ -666,19 +766,8 @@ async def bulk_download(body: dict):
     today = datetime.now().strftime("%Y-%m-%d")
     zip_name = f"videolab_{today}_{file_count}videos.zip"
 
-    async def _stream():
-        try:
-            with open(tmp_path, "rb") as f:
-                while chunk := f.read(1024 * 1024):
-                    yield chunk
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-
     return StreamingResponse(
-        _stream(),
+        _iter_file_then_unlink(tmp_path),
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="{zip_name}"',
@@ -698,10 +787,11 @@ async def bulk_delete(body: dict):
     if not job_ids:
         raise HTTPException(status_code=400, detail="No job IDs provided")
 
-    _load_jobs(project)
+    _load_jobs(project, include_stale=True)
     video_dir = get_project_video_dir(project)
     deleted_jobs = 0
     deleted_files = 0
+    removed: set[str] = set()
 
     for jid in job_ids:
         job = jobs.get(jid)
@@ -722,9 +812,10 @@ async def bulk_delete(body: dict):
                         target.unlink()
                         deleted_files += 1
         del jobs[jid]
+        removed.add(jid)
         deleted_jobs += 1
 
-    _save_jobs(project)
+    _save_jobs(project, removed=removed)
     return {"deleted_jobs": deleted_jobs, "deleted_files": deleted_files}
 
 
@@ -1,10 +1,13 @@
 import asyncio
 import base64
+import io
 import logging
 import os
 
+import httpx
 from dotenv import load_dotenv
-from openai import AsyncOpenAI, RateLimitError
+from openai import AsyncOpenAI
+from PIL import Image
 
 log = logging.getLogger("scraper.caption_extractor")
 
@@ -19,10 +22,32 @@ def _get_client() -> AsyncOpenAI:
         key = (os.getenv("OPENAI_API_KEY") or "").strip()
         if not key:
             raise RuntimeError("OPENAI_API_KEY not set in environment")
-        _client = AsyncOpenAI(api_key=key)
+        # Scrape batches fan out hundreds of vision calls; keep a wide pool of
+        # warm connections so they reuse TLS sessions.
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(60.0),
+        )
+        _client = AsyncOpenAI(api_key=key, http_client=http_client)
     return _client
 
 
+# Longest side sent to the vision model. Plenty for large burned-in caption
+# text, and ~4x fewer upload bytes than a raw 1080x1920 frame.
+VISION_MAX_SIDE = 1024
+
+
+def _shrink_for_vision(screenshot_bytes: bytes) -> bytes:
+    """Downscale to VISION_MAX_SIDE and re-encode as JPEG q85."""
+    img = Image.open(io.BytesIO(screenshot_bytes))
+    if max(img.size) <= VISION_MAX_SIDE and img.format == "JPEG":
+        return screenshot_bytes
+    img.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, "JPEG", quality=85, optimize=True)
+    return buf.getvalue()
+
+
 SYSTEM_PROMPT = (
     "You are an OCR assistant. Extract ONLY the burned-in caption text "
     "visible on this TikTok video screenshot. The captions are typically "
@@ -41,9 +66,11 @@ async def extract_caption(screenshot_bytes: bytes, _max_retries: int = 4) -> str
     """Send a screenshot to GPT-4.1 vision and extract burned-in caption text.
 
     Returns the extracted caption string, or empty string if none found.
-    Retries with exponential backoff on rate-limit (429) errors.
+    Rate-limit (429) and 5xx retries are left to the SDK, which backs off
+    exponentially and honours Retry-After.
     """
     client = _get_client()
+    screenshot_bytes = await asyncio.to_thread(_shrink_for_vision, screenshot_bytes)
     b64 = base64.b64encode(screenshot_bytes).decode()
 
     messages = [
@@ -63,21 +90,11 @@ async def extract_caption(screenshot_bytes: bytes, _max_retries: int = 4) -> str
         },
     ]
 
-    for attempt in range(_max_retries + 1):
-        try:
-            resp = await client.chat.completions.create(
-                model="gpt-4.1",
-                messages=messages,
-                max_tokens=500,
-                temperature=0.0,
-            )
-            text = resp.choices[0].message.content.strip()
-            return "" if text == "NO_CAPTION" else text
-        except RateLimitError as e:
-            if attempt == _max_retries:
-                raise
-            wait = min(2 ** attempt * 2, 30)
-            log.warning("Rate limited, retrying in %ds (attempt %d/%d)", wait, attempt + 1, _max_retries)
-            await asyncio.sleep(wait)
-
-    return ""
+    resp = await client.with_options(max_retries=_max_retries).chat.completions.create(
+        model="gpt-4.1",
+        messages=messages,
+        max_tokens=500,
+        temperature=0.0,
+    )
+    text = resp.choices[0].message.content.strip()
+    return "" if text == "NO_CAPTION" else text
@@ -2,11 +2,17 @@
 
 import asyncio
 import base64
+import functools
 import os
+import re
 import shutil
 import tempfile
 from pathlib import Path
 
+import httpx
+
+from scraper.tiktok_api import STORAGE_STATE_FILE, fetch_profile_items
+
 # ── Cookies support ──────────────────────────────────────────────────
 # If YTDLP_COOKIES env var is set (base64-encoded Netscape cookies.txt),
 # decode it to a temp file on first access.
@@ -36,6 +42,18 @@ def get_cookies_path() -> Path | None:
         return None
 
 
+# Shared client for thumbnail fallbacks: keeps TLS connections to the TikTok
+# CDN pooled across scrape jobs instead of a fresh urlopen per thumbnail.
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=15, follow_redirects=True)
+    return _http_client
+
+
 def _add_cookies(cmd: list[str]) -> list[str]:
     cp = get_cookies_path()
     if cp and cp.exists():
@@ -43,9 +61,20 @@ def _add_cookies(cmd: list[str]) -> list[str]:
     return cmd
 
 
+@functools.cache
+def _which(cmd: str) -> str | None:
+    # Binaries don't come and go mid-process; walk $PATH once per name.
+    return shutil.which(cmd)
+
+
+def _bin(cmd: str) -> str:
+    """Absolute path for cmd so each spawn skips the $PATH search."""
+    return _which(cmd) or cmd
+
+
 def _check_deps():
     for cmd in ("yt-dlp", "ffmpeg"):
-        if not shutil.which(cmd):
+        if not _which(cmd):
             raise RuntimeError(
                 f"{cmd} not found on PATH. Install it first:\n"
                 f"  brew install {cmd}   (macOS)\n"
@@ -73,11 +102,23 @@ async def _list_profile_videos_with_playwright(
             await pw.stop()
 
 
+_USERNAME_RE = re.compile(r"@([\w.]+)")
+
+
 async def list_profile_videos(
     profile_url: str, max_videos: int = 20, sort: str = "latest"
 ) -> list[str]:
     _check_deps()
 
+    # The JSON API needs no subprocess or browser. It only lists newest-first,
+    # and TikTok may refuse unsigned calls, so "popular" and any API failure
+    # go through yt-dlp / Playwright as before.
+    m = _USERNAME_RE.search(profile_url)
+    if sort == "latest" and m:
+        items = await fetch_profile_items(m.group(1), max_videos, STORAGE_STATE_FILE)
+        if items:
+            return [item["video_url"] for item in items]
+
     if sort == "popular":
         try:
             urls = await _list_profile_videos_with_playwright(
@@ -89,7 +130,7 @@ async def list_profile_videos(
             print(f"[frame_extractor] Playwright fallback failed: {e}", flush=True)
 
     cmd = [
-        "yt-dlp",
+        _bin("yt-dlp"),
         "--flat-playlist",
         "--no-warnings",
         "--no-check-certificates",
@@ -140,7 +181,7 @@ async def get_thumbnail(video_url: str, dest: Path) -> Path:
     # Output template without extension; yt-dlp adds the actual extension
     thumb_base = dest.with_suffix("")
     cmd = [
-        "yt-dlp",
+        _bin("yt-dlp"),
         "--no-download",
         "--no-warnings",
         "--no-check-certificates",
@@ -177,9 +218,9 @@ async def get_thumbnail(video_url: str, dest: Path) -> Path:
             variant.rename(dest)
             return dest
 
-    # Fallback: try the old urllib approach
+    # Fallback: ask yt-dlp for the thumbnail URL and fetch it directly
     cmd2 = [
-        "yt-dlp",
+        _bin("yt-dlp"),
         "--no-download",
         "--no-warnings",
         "--no-check-certificates",
@@ -198,14 +239,10 @@ async def get_thumbnail(video_url: str, dest: Path) -> Path:
         raise RuntimeError("yt-dlp thumbnail URL lookup timed out")
     thumb_url = stdout2.decode().strip()
     if thumb_url:
-        import urllib.request
-        import functools
-        loop = asyncio.get_running_loop()
         try:
-            data = await loop.run_in_executor(
-                None, functools.partial(urllib.request.urlopen, thumb_url, timeout=15)
-            )
-            dest.write_bytes(data.read())
+            resp = await _get_http_client().get(thumb_url)
+            resp.raise_for_status()
+            await asyncio.to_thread(dest.write_bytes, resp.content)
             return dest
         except Exception as e:
             raise RuntimeError(f"Thumbnail download failed: {e}")
@@ -221,7 +258,7 @@ async def download_video(
     dest.parent.mkdir(parents=True, exist_ok=True)
 
     cmd = [
-        "yt-dlp",
+        _bin("yt-dlp"),
         "--no-warnings",
         "--no-playlist",
         "-f",
@@ -266,7 +303,7 @@ async def extract_frame(
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     proc = await asyncio.create_subprocess_exec(
-        "ffmpeg",
+        _bin("ffmpeg"),
         "-y",
         "-ss",
         str(timestamp),
@@ -297,14 +334,47 @@ async def extract_multiple_frames(
     output_dir: Path,
     timestamps: tuple[float, ...] = (1.0, 3.0, 5.0),
 ) -> list[Path]:
-    """Extract frames at multiple timestamps. Returns list of frame paths."""
+    """Extract frames at multiple timestamps. Returns list of frame paths.
+
+    All timestamps come out of one ffmpeg process: each gets its own
+    fast-seeked input mapped to its own output, so there's a single spawn and
+    no decoding from the start of the file.
+    """
+    _check_deps()
     output_dir.mkdir(parents=True, exist_ok=True)
-    frames = []
+    outs = [output_dir / f"frame_{ts:.1f}s.jpg" for ts in timestamps]
+    if not outs:
+        return []
+
+    cmd = [_bin("ffmpeg"), "-y"]
     for ts in timestamps:
-        out = output_dir / f"frame_{ts:.1f}s.jpg"
-        try:
-            await extract_frame(video_path, out, timestamp=ts)
+        cmd += ["-ss", str(ts), "-i", str(video_path)]
+    for i, out in enumerate(outs):
+        cmd += ["-map", f"{i}:v:0", "-frames:v", "1", "-q:v", "2", str(out)]
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    await proc.wait()
+
+    if proc.returncode != 0:
+        # One bad output fails the whole run; redo frame by frame so the
+        # timestamps that do exist still come back.
+        frames = []
+        for ts, out in zip(timestamps, outs):
+            try:
+                await extract_frame(video_path, out, timestamp=ts)
+                frames.append(out)
+            except RuntimeError:
+                pass  # Video shorter than this timestamp
+        return frames
+
+    frames = []
+    for out in outs:
+        if out.exists() and out.stat().st_size > 0:
             frames.append(out)
-        except RuntimeError:
-            pass  # Video shorter than this timestamp
+        else:
+            out.unlink(missing_ok=True)  # Video shorter than this timestamp
     return frames
@@ -0,0 +1,109 @@
+"""Browserless TikTok profile listing via the web app's JSON endpoints.
+
+Best effort: TikTok can demand signed query params (msToken / X-Bogus) and
+answer unsigned calls with an empty body. Every failure returns None so the
+caller falls back to scrolling the profile in Playwright.
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+
+import httpx
+
+log = logging.getLogger("scraper.tiktok_api")
+
+# Playwright session saved by login_tiktok.py; API calls reuse its cookies
+STORAGE_STATE_FILE = Path(__file__).parent.parent / "tiktok_auth.json"
+
+_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+_REHYDRATION_RE = re.compile(
+    r'<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__"[^>]*>(.*?)</script>', re.S
+)
+_ITEM_LIST_URL = "https://www.tiktok.com/api/post/item_list/"
+_PAGE_SIZE = 35
+
+# username -> secUid; a profile's secUid never changes
+_sec_uid_cache: dict[str, str] = {}
+
+
+def _session_cookies(storage_state: Path | None) -> dict[str, str]:
+    """TikTok cookies from a Playwright storage_state file (login_tiktok.py)."""
+    if storage_state is None:
+        return {}
+    try:
+        state = json.loads(storage_state.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {
+        c["name"]: c["value"]
+        for c in state.get("cookies", [])
+        if "tiktok.com" in c.get("domain", "")
+    }
+
+
+async def _sec_uid(client: httpx.AsyncClient, username: str) -> str | None:
+    if username in _sec_uid_cache:
+        return _sec_uid_cache[username]
+    resp = await client.get(f"https://www.tiktok.com/@{username}")
+    resp.raise_for_status()
+    m = _REHYDRATION_RE.search(resp.text)
+    if not m:
+        return None
+    data = json.loads(m.group(1))
+    sec_uid = data["__DEFAULT_SCOPE__"]["webapp.user-detail"]["userInfo"]["user"]["secUid"]
+    _sec_uid_cache[username] = sec_uid
+    return sec_uid
+
+
+async def fetch_profile_items(
+    username: str, max_videos: int, storage_state: Path | None = None,
+) -> list[dict] | None:
+    """Newest-first [{"video_url", "video_id", "description", "cover_url"}].
+
+    Returns None (never raises) when the API can't be used, so callers can
+    fall back to the browser.
+    """
+    try:
+        async with httpx.AsyncClient(
+            headers={"User-Agent": _USER_AGENT, "Referer": "https://www.tiktok.com/"},
+            cookies=_session_cookies(storage_state),
+            follow_redirects=True,
+            timeout=15,
+        ) as client:
+            sec_uid = await _sec_uid(client, username)
+            if not sec_uid:
+                return None
+
+            items: list[dict] = []
+            cursor = 0
+            while len(items) < max_videos:
+                resp = await client.get(_ITEM_LIST_URL, params={
+                    "aid": 1988,
+                    "secUid": sec_uid,
+                    "count": min(_PAGE_SIZE, max_videos - len(items)),
+                    "cursor": cursor,
+                })
+                resp.raise_for_status()
+                data = resp.json()  # unsigned calls get an empty body -> ValueError
+                for item in data.get("itemList") or []:
+                    vid = item["id"]
+                    items.append({
+                        "video_id": vid,
+                        "video_url": f"https://www.tiktok.com/@{username}/video/{vid}",
+                        "description": item.get("desc", ""),
+                        "cover_url": (item.get("video") or {}).get("cover"),
+                    })
+                if not data.get("hasMore") or not data.get("itemList"):
+                    break
+                cursor = data.get("cursor", 0)
+    except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+        log.info("tiktok api listing unavailable for @%s: %s", username, e)
+        return None
+
+    return items[:max_videos] or None
@@ -1,23 +1,35 @@
 import asyncio
 import base64
 import csv
+import hashlib
+import os
 import random
 import re
+import weakref
 from pathlib import Path
 from typing import Callable
 
 from playwright.async_api import async_playwright, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 from playwright_stealth import Stealth
 
 from scraper.caption_extractor import extract_caption
+from scraper.tiktok_api import STORAGE_STATE_FILE, fetch_profile_items
 
 _stealth = Stealth()
 
 # Callback signature: async fn(event: str, data: dict)
 ProgressCB = Callable[[str, dict], None] | None
 
+# Video pages screenshotted in parallel, each in its own browser context. Kept
+# small: TikTok starts rate-limiting well before the host runs out of CPU.
+SCRAPE_CONCURRENCY = max(1, int(os.getenv("SCRAPE_CONCURRENCY", "3")))
 
-STORAGE_STATE_FILE = Path(__file__).parent.parent / "tiktok_auth.json"
+# "vision" (default): caption = burned-in text read by the vision model.
+# "dom": use the post description from the page and skip the vision call —
+# much faster, but it's the creator's description, not the on-video text.
+# Videos with no description still fall back to the vision model.
+CAPTION_SOURCE = os.getenv("SCRAPE_CAPTION_SOURCE", "vision")
 
 
 async def _create_browser(headless: bool = True):
@@ -26,7 +38,12 @@ async def _create_browser(headless: bool = True):
         headless=headless,
         args=["--disable-blink-features=AutomationControlled", "--no-sandbox"],
     )
+    context, page = await _new_page(browser)
+    return pw, browser, context, page
+
 
+async def _new_page(browser):
+    """Open a fresh context (with the saved session, if any) and stealth page."""
     # Load saved session if exists
     storage_state = None
     if STORAGE_STATE_FILE.exists():
@@ -44,7 +61,7 @@ async def _create_browser(headless: bool = True):
     )
     page = await context.new_page()
     await _stealth.apply_stealth_async(page)
-    return pw, browser, context, page
+    return context, page
 
 
 async def login_and_save_session():
@@ -77,25 +94,90 @@ async def _human_delay(lo: float = 1.5, hi: float = 3.5):
     await asyncio.sleep(random.uniform(lo, hi))
 
 
-async def _broadcast_frame(page: Page, on_progress: ProgressCB):
+# Live-view preview frames: low quality and ~240px wide are plenty for a
+# progress thumbnail and keep base64 + WebSocket egress small.
+LIVE_FRAME_QUALITY = 35
+LIVE_FRAME_WIDTH = 240
+
+# Caption screenshots feed OCR/vision; 85 keeps burned-in text crisp while
+# trimming bytes versus 90.
+SCREENSHOT_QUALITY = 85
+
+# One CDP session per page, reused for every capture on it.
+_cdp_sessions: "weakref.WeakKeyDictionary[Page, object]" = weakref.WeakKeyDictionary()
+
+
+async def _capture_jpeg(
+    page: Page, quality: int, clip: dict | None = None, scale: float = 1
+) -> bytes:
+    """JPEG screenshot via CDP Page.captureScreenshot with optimizeForSpeed.
+
+    Chromium's speed-optimised encoder is noticeably quicker than the default
+    path behind page.screenshot(); falls back to a plain viewport shot if CDP
+    is unavailable. clip is in document coordinates; scale resizes the output.
+    """
+    params: dict = {"format": "jpeg", "quality": quality, "optimizeForSpeed": True}
+    if clip:
+        params["clip"] = {**clip, "scale": scale}
+    try:
+        cdp = _cdp_sessions.get(page)
+        if cdp is None:
+            cdp = await page.context.new_cdp_session(page)
+            _cdp_sessions[page] = cdp
+        result = await cdp.send("Page.captureScreenshot", params)
+        return base64.b64decode(result["data"])
+    except Exception:
+        _cdp_sessions.pop(page, None)
+        # page.screenshot clips are viewport-relative, so just take the view.
+        return await page.screenshot(type="jpeg", quality=quality)
+
+
+async def _broadcast_frame(
+    page: Page, on_progress: ProgressCB, last_digest: bytes | None = None
+) -> bytes | None:
+    """Send a live frame; returns its digest so unchanged frames can be skipped."""
     if not on_progress:
-        return
+        return last_digest
     try:
-        frame_bytes = await page.screenshot(type="jpeg", quality=50)
-        b64 = base64.b64encode(frame_bytes).decode()
+        view = await page.evaluate(
+            "() => ({x: window.scrollX, y: window.scrollY,"
+            " width: window.innerWidth, height: window.innerHeight})"
+        )
+        frame_bytes = await _capture_jpeg(
+            page,
+            quality=LIVE_FRAME_QUALITY,
+            clip=view,
+            scale=min(1, LIVE_FRAME_WIDTH / max(view["width"], 1)),
+        )
+        digest = hashlib.blake2b(frame_bytes, digest_size=16).digest()
+        if digest == last_digest:
+            return last_digest  # Static page — nothing new to send
+        b64 = base64.b64encode(frame_bytes).decode("ascii")
         await on_progress("frame", {"b64": b64})
+        return digest
     except Exception as e:
         print(f"[frame] screenshot error: {e}")
+        return last_digest
 
 
-async def _stream_loop(page: Page, on_progress: ProgressCB, stop: asyncio.Event):
+async def _stream_loop(
+    page: Page,
+    on_progress: ProgressCB,
+    stop: asyncio.Event,
+):
+    """Screenshot the page every 500ms, sending only frames that changed."""
+    last_digest = None
     while not stop.is_set():
-        await _broadcast_frame(page, on_progress)
+        last_digest = await _broadcast_frame(page, on_progress, last_digest)
         await asyncio.sleep(0.5)
 
 
+_USERNAME_RE = re.compile(r"@([\w.]+)")
+_VIDEO_ID_RE = re.compile(r"/video/(\d+)")
+
+
 def _extract_username(profile_url: str) -> str:
-    m = re.search(r"@([\w.]+)", profile_url)
+    m = _USERNAME_RE.search(profile_url)
     return m.group(1) if m else "unknown"
 
 
@@ -111,17 +193,32 @@ def _normalize_profile_url(input_str: str) -> str:
 
 
 def _video_id(url: str) -> str:
-    m = re.search(r"/video/(\d+)", url)
+    m = _VIDEO_ID_RE.search(url)
     return m.group(1) if m else "unknown"
 
 
 # ── Collect video URLs ──────────────────────────────────────────────────
 
+_VIDEO_LINK_SELECTOR = 'a[href*="/video/"]'
+
+
+async def _wait_for_grid(page: Page, timeout_ms: int) -> None:
+    """Return as soon as the profile grid shows a video link, or at timeout.
+
+    TikTok pages keep media and analytics requests open, so "networkidle"
+    rarely fires; the first grid link is the signal that matters.
+    """
+    try:
+        await page.wait_for_selector(_VIDEO_LINK_SELECTOR, timeout=timeout_ms)
+    except PlaywrightTimeout:
+        pass  # empty/private profile or slow load — the scroll loop copes
+
+
 async def collect_video_urls(
     page: Page, profile_url: str, max_videos: int, sort: str = "latest",
 ) -> list[str]:
     await page.goto(profile_url, wait_until="domcontentloaded", timeout=30_000)
-    await asyncio.sleep(3)
+    await _wait_for_grid(page, 8000)
 
     # Try to click the sort tab if sorting by popular
     if sort == "popular":
@@ -137,7 +234,15 @@ async def collect_video_urls(
                 tab = await page.query_selector(sel)
                 if tab:
                     await tab.click()
-                    await asyncio.sleep(2)
+                    # The grid is swapped out in place; wait for the old
+                    # links to detach, then for the re-sorted ones.
+                    first = await page.query_selector(_VIDEO_LINK_SELECTOR)
+                    if first:
+                        try:
+                            await first.wait_for_element_state("hidden", timeout=3000)
+                        except PlaywrightTimeout:
+                            pass
+                    await _wait_for_grid(page, 5000)
                     break
         except Exception:
             pass  # fall back to default (latest)
@@ -147,22 +252,21 @@ async def collect_video_urls(
     stale_rounds = 0
 
     for _ in range(50):
-        links = await page.query_selector_all('a[href*="/video/"]')
-        for link in links:
-            href = await link.get_attribute("href")
+        # One round trip for every link on the page; a.href is already
+        # absolute, so relative and absolute forms can't both slip into seen.
+        hrefs = await page.eval_on_selector_all(
+            _VIDEO_LINK_SELECTOR, "els => els.map(el => el.href)"
+        )
+        prev_count = len(urls)
+        for href in hrefs:
             if href and href not in seen:
-                if href.startswith("/"):
-                    href = "https://www.tiktok.com" + href
                 seen.add(href)
                 urls.append(href)
 
         if len(urls) >= max_videos:
             break
 
-        prev_count = len(urls)
-        await page.evaluate("window.scrollBy(0, window.innerHeight * 2)")
-        await _human_delay(1.5, 3.0)
-
+        # Stale = this round's scroll surfaced nothing new
         if len(urls) == prev_count:
             stale_rounds += 1
             if stale_rounds >= 3:
@@ -170,59 +274,85 @@ async def collect_video_urls(
         else:
             stale_rounds = 0
 
+        await page.evaluate("window.scrollBy(0, window.innerHeight * 2)")
+        await _human_delay(1.5, 3.0)
+
     return urls[:max_videos]
 
 
 # ── Screenshot a single video ───────────────────────────────────────────
 
-async def screenshot_video(page: Page, video_url: str) -> bytes:
-    await page.goto(video_url, wait_until="domcontentloaded", timeout=30_000)
-    await asyncio.sleep(2)
-
-    # Remove keyboard shortcuts modal from DOM entirely
-    await page.evaluate("""
+# Everything between navigation and capture in one evaluate: waits on DOM and
+# media events instead of fixed sleeps, and hands back the <video> box in
+# document coordinates (as CDP's clip expects), or null to shoot the page.
+_PREPARE_VIDEO_JS = """
+async () => {
+    const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+    const removeOverlays = () => {
+        // Keyboard-shortcuts modal and friends cover the frame
         document.querySelectorAll('[class*="keyboard"], [class*="Keyboard"], [class*="modal"], [class*="Modal"]').forEach(el => el.remove());
         document.querySelectorAll('div').forEach(el => {
             if (el.textContent && el.textContent.includes('keyboard shortcuts')) el.remove();
         });
-    """)
-    await asyncio.sleep(0.3)
+    };
+    const waitFor = (target, event, ms) => new Promise(resolve => {
+        const t = setTimeout(resolve, ms);
+        target.addEventListener(event, () => { clearTimeout(t); resolve(); }, {once: true});
+    });
+
+    let v = null;
+    for (let i = 0; i < 100 && !(v = document.querySelector('video')); i++) await sleep(100);
+    removeOverlays();
+    if (!v) return null;
+
+    v.muted = true;
+    v.play().catch(() => {});
+    if (v.readyState < 2) await waitFor(v, 'loadeddata', 5000);
+    v.pause();
+    const target = Math.min(2, v.duration || 2);
+    if (Math.abs(v.currentTime - target) > 0.01) {
+        const seeked = waitFor(v, 'seeked', 3000);
+        v.currentTime = target;
+        await seeked;
+    }
+    removeOverlays();
+    // Let the seeked frame paint before the capture
+    await new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
+
+    const r = v.getBoundingClientRect();
+    if (!r.width || !r.height) return null;
+    return {x: r.left + window.scrollX, y: r.top + window.scrollY,
+            width: r.width, height: r.height};
+}
+"""
 
-    # Wait for video to load
-    try:
-        await page.wait_for_selector("video", timeout=10_000)
-    except Exception:
-        pass
 
-    await asyncio.sleep(1)
+async def screenshot_video(page: Page, video_url: str) -> bytes:
+    await page.goto(video_url, wait_until="domcontentloaded", timeout=30_000)
+    clip = await page.evaluate(_PREPARE_VIDEO_JS)
+    return await _capture_jpeg(page, quality=SCREENSHOT_QUALITY, clip=clip)
 
-    # Try to play and seek video
-    await page.evaluate("""
-        const v = document.querySelector('video');
-        if (v) {
-            v.muted = true;
-            v.play().catch(() => {});
-        }
-    """)
-    await asyncio.sleep(2)
-
-    await page.evaluate("""
-        const v = document.querySelector('video');
-        if (v) {
-            v.pause();
-            v.currentTime = Math.min(2, v.duration || 2);
-        }
-    """)
-    await asyncio.sleep(0.5)
 
-    video_el = await page.query_selector("video")
-    if video_el:
-        return await video_el.screenshot(type="jpeg", quality=90)
-    return await page.screenshot(type="jpeg", quality=90)
+async def read_description(page: Page) -> str:
+    """Post description from the already-loaded video page ("" if absent)."""
+    try:
+        text = await page.text_content('[data-e2e="browse-video-desc"]', timeout=2000)
+    except Exception:
+        return ""
+    return (text or "").strip()
 
 
 # ── Main orchestrator ────────────────────────────────────────────────────
 
+def _write_results_csv(csv_path: Path, results: list[dict]) -> None:
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=[
+            "video_id", "video_url", "caption", "description", "screenshot", "error",
+        ])
+        writer.writeheader()
+        writer.writerows(results)
+
+
 async def scrape_profile_captions(
     profile_url: str,
     max_videos: int = 20,
@@ -233,6 +363,7 @@ async def scrape_profile_captions(
     """Scrape a TikTok profile, screenshot each video, extract captions.
 
     Accepts @username, username, or full URL.
+    With no on_progress no live frames are captured at all.
     Saves screenshots to output_dir/<username>/screenshots/
     and a CSV to output_dir/<username>/captions.csv
 
@@ -245,77 +376,126 @@ async def scrape_profile_captions(
     screenshots_dir.mkdir(parents=True, exist_ok=True)
 
     pw, browser, context, page = await _create_browser()
+    extra_contexts = []
     stop_stream = asyncio.Event()
+    stream_task = None
+    # Per-video and page-release tasks, cancelled before the browser closes
+    tasks: list[asyncio.Task] = []
 
     try:
-        stream_task = asyncio.create_task(
-            _stream_loop(page, on_progress, stop_stream)
-        )
+        if on_progress:
+            stream_task = asyncio.create_task(
+                _stream_loop(page, on_progress, stop_stream)
+            )
 
         if on_progress:
             await on_progress("collecting", {"username": username})
 
-        video_urls = await collect_video_urls(page, profile_url, max_videos, sort)
+        # The JSON API skips loading and scrolling the profile page. It only
+        # lists newest-first, and TikTok may refuse unsigned calls, so
+        # "popular" and any API failure go through the browser.
+        items = None
+        if sort == "latest":
+            items = await fetch_profile_items(username, max_videos, STORAGE_STATE_FILE)
+        if items:
+            video_urls = [item["video_url"] for item in items]
+        else:
+            video_urls = await collect_video_urls(page, profile_url, max_videos, sort)
 
         if on_progress:
             await on_progress("urls_collected", {"count": len(video_urls)})
 
-        results: list[dict] = []
-
-        for i, url in enumerate(video_urls):
-            vid = _video_id(url)
+        total = len(video_urls)
+        results: list[dict | None] = [None] * total
+
+        # Page pool: the main page (the one being streamed) plus extra
+        # contexts, each worker borrowing a page for one video at a time.
+        pages: asyncio.Queue[Page] = asyncio.Queue()
+        pages.put_nowait(page)
+        for _ in range(min(SCRAPE_CONCURRENCY, total) - 1):
+            extra_context, extra_page = await _new_page(browser)
+            extra_contexts.append(extra_context)
+            pages.put_nowait(extra_page)
+
+        async def _capture_one(i: int, url: str) -> tuple[bytes, str]:
+            """Browser phase: borrow a page only for navigation + capture."""
+            worker_page = await pages.get()
             try:
                 if on_progress:
                     await on_progress("screenshotting", {
-                        "index": i, "total": len(video_urls), "video_url": url,
+                        "index": i, "total": total, "video_url": url,
                     })
 
-                screenshot = await screenshot_video(page, url)
-
-                # Save screenshot to disk
-                img_path = screenshots_dir / f"{vid}.jpg"
-                img_path.write_bytes(screenshot)
+                screenshot = await screenshot_video(worker_page, url)
+                description = await read_description(worker_page)
 
                 await _human_delay(0.5, 1.5)
+                return screenshot, description
+            finally:
+                tasks.append(asyncio.create_task(_release_page(worker_page)))
+
+        async def _release_page(worker_page: Page) -> None:
+            # Same per-page pacing between navigations as before, served in
+            # the background so the caller goes straight to its caption phase
+            await _human_delay(2.0, 4.0)
+            pages.put_nowait(worker_page)
+
+        async def _process_one(i: int, url: str) -> None:
+            vid = _video_id(url)
+            try:
+                screenshot, description = await _capture_one(i, url)
 
+                # Caption phase runs while the page serves its pacing delay
+                # and goes back to the pool, so the next video loads while the
+                # vision call is in flight. The disk write overlaps it too.
                 if on_progress:
                     await on_progress("extracting", {
-                        "index": i, "total": len(video_urls), "video_url": url,
+                        "index": i, "total": total, "video_url": url,
                     })
 
-                caption = await extract_caption(screenshot)
-
-                results.append({
+                img_path = screenshots_dir / f"{vid}.jpg"
+                write = asyncio.to_thread(img_path.write_bytes, screenshot)
+                if CAPTION_SOURCE == "dom" and description:
+                    await write
+                    caption = description
+                else:
+                    _, caption = await asyncio.gather(
+                        write, extract_caption(screenshot)
+                    )
+                del screenshot  # On disk already; don't hold it until video_done
+
+                results[i] = {
                     "video_url": url,
                     "video_id": vid,
                     "screenshot": str(img_path),
                     "caption": caption,
+                    "description": description,
                     "error": None,
-                })
+                }
             except Exception as e:
-                results.append({
+                results[i] = {
                     "video_url": url,
                     "video_id": vid,
                     "screenshot": None,
                     "caption": None,
+                    "description": None,
                     "error": str(e),
-                })
+                }
 
             if on_progress:
                 await on_progress("video_done", {
-                    "index": i, "total": len(video_urls), "result": results[-1],
+                    "index": i, "total": total, "result": results[i],
                 })
 
-            await _human_delay(2.0, 4.0)
+        tasks.extend(
+            asyncio.create_task(_process_one(i, url))
+            for i, url in enumerate(video_urls)
+        )
+        await asyncio.gather(*tasks)
 
-        # Write CSV
+        # Write CSV (off the loop so live frames keep flowing)
         csv_path = job_dir / "captions.csv"
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "video_id", "video_url", "caption", "screenshot", "error",
-            ])
-            writer.writeheader()
-            writer.writerows(results)
+        await asyncio.to_thread(_write_results_csv, csv_path, results)
 
         if on_progress:
             await on_progress("csv_written", {"path": str(csv_path)})
@@ -327,12 +507,22 @@ async def scrape_profile_captions(
         }
 
     finally:
+        # gather() doesn't cancel siblings when one fails or we're cancelled;
+        # don't let captures outlive the browser. Loop, since a cancelled
+        # capture still schedules its page release.
+        while pending := [t for t in tasks if not t.done()]:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
         stop_stream.set()
-        stream_task.cancel()
-        try:
-            await stream_task
-        except asyncio.CancelledError:
-            pass
+        if stream_task is not None:
+            stream_task.cancel()
+            try:
+                await stream_task
+            except asyncio.CancelledError:
+                pass
+        for extra_context in extra_contexts:
+            await extra_context.close()
         await context.close()
         await browser.close()
         await pw.stop()
@@ -1,33 +1,123 @@
 import asyncio
-import base64
 import io
-import uuid
+import os
+import secrets
+import time
 import zipfile
+from collections.abc import Iterator
+from pathlib import Path
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
-from providers import PROVIDERS
-from providers.base import API_KEYS, OUTPUT_DIR, generate_one
+from providers import PROVIDERS, available_providers
+from providers.base import API_KEYS, OUTPUT_DIR, encode_data_uri, generate_one
 
 app = FastAPI()
 
 jobs: dict[str, dict] = {}
 
+# Jobs live only in memory here; finished ones are dropped after this long so
+# a long-running server doesn't accumulate every job it ever ran. MAX_JOBS is a
+# hard cap on top, for bursts that finish faster than the TTL.
+JOB_TTL_SECS = 3600
+MAX_JOBS = 1000
+_TERMINAL_STATUSES = {"done", "error"}
+
+
+def _is_finished(job: dict) -> bool:
+    return all(v.get("status") in _TERMINAL_STATUSES for v in job["videos"])
+
+
+def _prune_jobs() -> None:
+    cutoff = time.time() - JOB_TTL_SECS
+    for jid in [
+        jid for jid, job in jobs.items()
+        if job.get("created_at", 0) < cutoff and _is_finished(job)
+    ]:
+        del jobs[jid]
+    # dicts keep insertion order, so this walks oldest first
+    excess = len(jobs) - MAX_JOBS
+    if excess > 0:
+        for jid in [jid for jid, job in jobs.items() if _is_finished(job)][:excess]:
+            del jobs[jid]
+
+# Per-provider cap on in-flight generate_one calls; the rest of a job queues
+# behind it instead of tripping provider rate limits.
+PROVIDER_CONCURRENCY = int(os.getenv("PROVIDER_CONCURRENCY", "4"))
+PROVIDER_SEMAPHORES: dict[str, asyncio.Semaphore] = {}
+# Process-wide cap across all providers, so many concurrent callers can't
+# stack up more outbound generations than the host handles comfortably.
+GEN_SEMAPHORE = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_GENS", "8")))
+# The loop only holds weak refs to tasks; keep them alive until done.
+GEN_TASKS: set[asyncio.Task] = set()
+
+
+async def _gated_generate(provider: str, *args) -> None:
+    sem = PROVIDER_SEMAPHORES.get(provider)
+    if sem is None:
+        sem = PROVIDER_SEMAPHORES[provider] = asyncio.Semaphore(PROVIDER_CONCURRENCY)
+    async with sem, GEN_SEMAPHORE:
+        await generate_one(*args)
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable buffer that zipfile streams into.
+
+    zipfile falls back to data descriptors when the target can't seek, so the
+    archive can be drained and sent chunk by chunk as it's produced.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_zip(files: list[tuple[Path, str]], compression: int) -> Iterator[bytes]:
+    """Yield a ZIP of (path, arcname) files without holding the archive in memory.
+
+    Files that don't exist are left out.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression) as zf:
+        for filepath, arcname in files:
+            try:
+                src = open(filepath, "rb")
+            except FileNotFoundError:
+                continue
+            with src:
+                # Header fields from the open handle: one fstat per file instead
+                # of exists() + ZipInfo.from_file()'s stat + open.
+                st = os.fstat(src.fileno())
+                info = zipfile.ZipInfo(arcname, time.localtime(st.st_mtime)[:6])
+                info.external_attr = (st.st_mode & 0xFFFF) << 16
+                info.file_size = st.st_size
+                info.compress_type = compression
+                with zf.open(info, "w") as dst:
+                    while chunk := src.read(1024 * 1024):
+                        dst.write(chunk)
+                        if data := sink.drain():
+                            yield data
+    # Trailing data descriptor + central directory
+    if data := sink.drain():
+        yield data
+
 
 @app.get("/api/providers")
-async def list_providers():
-    available = []
-    for pid, info in PROVIDERS.items():
-        if API_KEYS.get(info["key_id"]):
-            available.append(
-                {
-                    "id": pid,
-                    **{k: v for k, v in info.items() if k != "module"},
-                }
-            )
-    return available
+async def list_providers() -> list[dict]:
+    return available_providers()
 
 
 @app.post("/api/generate")
@@ -52,15 +142,15 @@ async def generate(
     duration = max(1, min(duration, 15))
 
     image_data_uri = None
-    if media and media.size and media.size > 0:
-        raw = await media.read()
-        b64 = base64.b64encode(raw).decode()
+    if media and media.size:
         ct = media.content_type or "image/jpeg"
-        image_data_uri = f"data:{ct};base64,{b64}"
+        image_data_uri = await asyncio.to_thread(encode_data_uri, media.file, ct)
 
-    job_id = uuid.uuid4().hex[:12]
+    _prune_jobs()
+    job_id = secrets.token_urlsafe(9)  # 12 URL-safe chars, 72 random bits
     jobs[job_id] = {
         "id": job_id,
+        "created_at": time.time(),
         "prompt": prompt,
         "provider": provider,
         "count": count,
@@ -68,8 +158,9 @@ async def generate(
     }
 
     for i in range(count):
-        asyncio.create_task(
-            generate_one(
+        task = asyncio.create_task(
+            _gated_generate(
+                provider,
                 job_id,
                 i,
                 provider,
@@ -81,19 +172,22 @@ async def generate(
                 jobs,
             )
         )
+        GEN_TASKS.add(task)
+        task.add_done_callback(GEN_TASKS.discard)
 
     return {"job_id": job_id, "count": count}
 
 
 @app.get("/api/jobs/{job_id}")
-async def get_job(job_id: str):
+async def get_job(job_id: str) -> dict:
     if job_id not in jobs:
         raise HTTPException(status_code=404, detail="Job not found")
     return jobs[job_id]
 
 
 @app.get("/api/jobs")
-async def list_jobs():
+async def list_jobs() -> list[dict]:
+    _prune_jobs()
     return list(jobs.values())
 
 
@@ -108,15 +202,13 @@ async def download_all(job_id: str):
     if not done_videos:
         raise HTTPException(status_code=400, detail="No completed videos to download")
 
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-        for v in done_videos:
-            filepath = OUTPUT_DIR / v["file"]
-            if filepath.exists():
-                zf.write(filepath, v["file"])
-    buf.seek(0)
+    # Missing files are skipped by _stream_zip when it fails to open them
+    files = [(OUTPUT_DIR / v["file"], v["file"]) for v in done_videos]
+    # Videos are already compressed; ZIP_STORED skips a pointless DEFLATE pass.
+    # Sync generator: Starlette iterates it in the threadpool, so file reads
+    # stay off the event loop and bytes flow immediately.
     return StreamingResponse(
-        buf,
+        _stream_zip(files, zipfile.ZIP_STORED),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename=videolab_{job_id}.zip"},
     )
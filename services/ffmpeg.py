@@ -8,6 +8,7 @@ battle-tested color-matrix math without cross-router imports.
 import asyncio
 import logging
 import math
+import os
 
 log = logging.getLogger("ffmpeg")
 
@@ -33,6 +34,29 @@ TIKTOK_ENCODE_ARGS: list[str] = [
 ]
 
 
+# Speed-priority variant of TIKTOK_ENCODE_ARGS for overlay-only burns.
+# ultrafast + fastdecode roughly halves encode CPU; the cost is a larger file
+# at the same CRF (no CABAC/B-frames) and slightly softer detail, which is hard
+# to see on short social clips. The bitrate floor/cap and output format are
+# unchanged so the result is still TikTok-ready.
+TIKTOK_FAST_ENCODE_ARGS: list[str] = [
+    "-c:v", "libx264",
+    "-preset", "ultrafast",
+    "-tune", "fastdecode",
+    "-crf", "20",
+    "-minrate", "8M",
+    "-maxrate", "20M",
+    "-bufsize", "20M",
+    "-profile:v", "high",
+    "-level", "4.2",
+    "-pix_fmt", "yuv420p",
+    "-r", "30",
+    "-movflags", "+faststart",
+    "-c:a", "aac",
+    "-b:a", "192k",
+]
+
+
 # Standard encode that preserves the source's frame rate and skips TikTok-
 # specific rate caps. Used by the video router's /color-correct endpoint to
 # apply color tweaks to arbitrary-aspect-ratio generated videos without
@@ -51,6 +75,49 @@ STANDARD_ENCODE_ARGS: list[str] = [
     "-c:a", "copy",
 ]
 
+# Fast encode for the post-generation 16:9 → 9:16 crops. The crop has to
+# re-encode, but with ffmpeg's default x264 settings it dominated
+# post-processing; ultrafast on all cores at CRF 20 keeps the source's look
+# while the output is still re-encoded (burn, color-correct) downstream.
+CROP_ENCODE_ARGS: list[str] = [
+    "-c:v", "libx264",
+    "-preset", "ultrafast",
+    "-tune", "fastdecode",
+    "-crf", "20",
+    "-threads", "0",
+    "-pix_fmt", "yuv420p",
+    "-movflags", "+faststart",
+    "-c:a", "copy",
+]
+
+
+# Optional OpenCL offload for the burn overlay composite. Opt-in via
+# FFMPEG_OPENCL=1 (Railway has no GPU) and only used once a probe confirms the
+# local ffmpeg build can open an OpenCL device and ships overlay_opencl.
+OPENCL_INPUT_ARGS: list[str] = ["-init_hw_device", "opencl=ocl", "-filter_hw_device", "ocl"]
+
+_opencl_available: bool | None = None
+
+
+async def opencl_available() -> bool:
+    """True if burns may use the OpenCL overlay path. Probed once per process."""
+    global _opencl_available
+    if _opencl_available is None:
+        _opencl_available = False
+        if os.getenv("FFMPEG_OPENCL", "") == "1":
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    "ffmpeg", "-hide_banner", *OPENCL_INPUT_ARGS[:2], "-filters",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                out, _ = await proc.communicate()
+                _opencl_available = proc.returncode == 0 and b"overlay_opencl" in out
+            except OSError as e:
+                log.warning("OpenCL probe failed: %s", e)
+            log.info("ffmpeg OpenCL overlay: %s", "enabled" if _opencl_available else "unavailable")
+    return _opencl_available
+
 
 def is_default_cc(cc: dict | None) -> bool:
     """True if the CC dict is None, empty, or has all-zero values."""
@@ -68,30 +135,58 @@ def is_default_cc(cc: dict | None) -> bool:
     return True
 
 
-def build_cc_filter(cc: dict | None, scale: str | None = None) -> str:
-    """Build an ffmpeg `-vf` filter string for color correction.
+_IDENTITY3 = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
 
-    Args:
-        cc: Optional dict with keys brightness/contrast/saturation/sharpness/
-            shadow/temperature/tint/fade (each an integer slider value). None
-            or all-default values produces a no-op (see `scale` behavior).
-        scale: Optional trailing scale filter.
-            - None → no scale filter, input dimensions pass through.
-            - "1080:1920" → appends `scale=1080:1920:flags=lanczos,setsar=1`
-              (Burn tab's TikTok default).
 
-    Returns:
-        A comma-joined filter string ready for ffmpeg's `-vf` argument. When
-        there's nothing to do (default CC + no scale), returns "null" (ffmpeg's
-        no-op filter) so the command still validates.
-    """
-    scale_filter = (
-        f"scale={scale}:flags=lanczos,setsar=1" if scale else None
+def _mat_mul(a, b) -> tuple:
+    return tuple(
+        tuple(a[i][0] * b[0][j] + a[i][1] * b[1][j] + a[i][2] * b[2][j] for j in range(3))
+        for i in range(3)
     )
 
-    # Fast path: no CC → just the scale (or null if no scale either).
+
+def _hue_rotate_matrix(deg: float) -> tuple:
+    """CSS hue-rotate(deg) as a 3x3 RGB matrix."""
+    rad = math.radians(deg)
+    cos_a, sin_a = math.cos(rad), math.sin(rad)
+    return (
+        (
+            0.213 + 0.787 * cos_a - 0.213 * sin_a,
+            0.715 - 0.715 * cos_a - 0.715 * sin_a,
+            0.072 - 0.072 * cos_a + 0.928 * sin_a,
+        ),
+        (
+            0.213 - 0.213 * cos_a + 0.143 * sin_a,
+            0.715 + 0.285 * cos_a + 0.140 * sin_a,
+            0.072 - 0.072 * cos_a - 0.283 * sin_a,
+        ),
+        (
+            0.213 - 0.213 * cos_a - 0.787 * sin_a,
+            0.715 - 0.715 * cos_a + 0.715 * sin_a,
+            0.072 + 0.928 * cos_a + 0.072 * sin_a,
+        ),
+    )
+
+
+def compose_color_matrix(cc: dict | None) -> tuple[tuple, tuple, float] | None:
+    """Compose the CSS-equivalent slider transforms into one 3x3 matrix + offset.
+
+    The CSS filters apply in the order brightness → contrast → saturate →
+    temperature (sepia / hue-rotate) → tint (hue-rotate). Brightness and
+    contrast are scalar, so the whole chain collapses to a closed form:
+
+        P   = M_tint @ M_temp @ M_sat
+        M   = P * (b * c)
+        off = P @ [0.5 * (1 - c)] * 3
+
+    Inactive sliders contribute identity / 1.0, so every call does the same
+    work regardless of which sliders are set.
+
+    Returns:
+        (mat, off, sharpness), or None when the sliders are an effective no-op.
+    """
     if is_default_cc(cc):
-        return scale_filter or "null"
+        return None
 
     b_raw = float(cc.get("brightness", 0))
     c_raw = float(cc.get("contrast", 0))
@@ -117,106 +212,59 @@ def build_cc_filter(cc: dict | None, scale: str | None = None) -> str:
 
     sharpness = sh_raw / 50
 
-    # Second default check after the CSS-equivalent transforms — a combination
-    # of sliders (e.g. fade + shadow) may cancel out to an effective no-op.
-    is_default = (
-        abs(css_brightness - 1.0) < 0.005
-        and abs(css_contrast - 1.0) < 0.005
-        and abs(css_saturate - 1.0) < 0.005
-        and abs(t_raw) <= 1
-        and abs(ti_raw) <= 1
-        and sharpness < 0.001
+    # Snap near-identity sliders to exactly 1.0 / 0 so a combination that
+    # cancels out (e.g. fade + shadow) is detected as a no-op below.
+    b = css_brightness if abs(css_brightness - 1.0) >= 0.005 else 1.0
+    c = css_contrast if abs(css_contrast - 1.0) >= 0.005 else 1.0
+    s = css_saturate if abs(css_saturate - 1.0) >= 0.005 else 1.0
+    t = t_raw if abs(t_raw) > 1 else 0.0
+    ti = ti_raw if abs(ti_raw) > 1 else 0.0
+
+    if b == 1.0 and c == 1.0 and s == 1.0 and t == 0.0 and ti == 0.0 and sharpness < 0.001:
+        return None
+
+    # CSS saturate(s): BT.709 saturation matrix (identity at s == 1)
+    sr, sg, sb = 0.2126, 0.7152, 0.0722
+    m_sat = (
+        (sr + (1 - sr) * s, sg - sg * s, sb - sb * s),
+        (sr - sr * s, sg + (1 - sg) * s, sb - sb * s),
+        (sr - sr * s, sg - sg * s, sb + (1 - sb) * s),
     )
-    if is_default:
-        return scale_filter or "null"
-
-    mat = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
-    off = [0.0, 0.0, 0.0]
-
-    def mat_mul(a: list, b: list) -> list:
-        return [
-            [sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3)]
-            for i in range(3)
-        ]
-
-    def mat_vec(m: list, v: list) -> list:
-        return [sum(m[i][j] * v[j] for j in range(3)) for i in range(3)]
-
-    if abs(css_brightness - 1.0) >= 0.005:
-        b = css_brightness
-        mat = [[b * mat[i][j] for j in range(3)] for i in range(3)]
-        off = [b * o for o in off]
-
-    if abs(css_contrast - 1.0) >= 0.005:
-        c = css_contrast
-        bias = 0.5 * (1 - c)
-        mat = [[c * mat[i][j] for j in range(3)] for i in range(3)]
-        off = [c * o + bias for o in off]
-
-    if abs(css_saturate - 1.0) >= 0.005:
-        s = css_saturate
-        sr, sg, sb = 0.2126, 0.7152, 0.0722
-        sat_mat = [
-            [sr + (1 - sr) * s, sg - sg * s, sb - sb * s],
-            [sr - sr * s, sg + (1 - sg) * s, sb - sb * s],
-            [sr - sr * s, sg - sg * s, sb + (1 - sb) * s],
-        ]
-        off = mat_vec(sat_mat, off)
-        mat = mat_mul(sat_mat, mat)
-
-    if abs(t_raw) > 1:
-        if t_raw > 0:
-            amt = min(1.0, t_raw / 200)
-            t_mat = [
-                [1 - amt + amt * 0.393, amt * 0.769, amt * 0.189],
-                [amt * 0.349, 1 - amt + amt * 0.686, amt * 0.168],
-                [amt * 0.272, amt * 0.534, 1 - amt + amt * 0.131],
-            ]
-        else:
-            rad = math.radians(t_raw / 5)
-            cos_a, sin_a = math.cos(rad), math.sin(rad)
-            t_mat = [
-                [
-                    0.213 + 0.787 * cos_a - 0.213 * sin_a,
-                    0.715 - 0.715 * cos_a - 0.715 * sin_a,
-                    0.072 - 0.072 * cos_a + 0.928 * sin_a,
-                ],
-                [
-                    0.213 - 0.213 * cos_a + 0.143 * sin_a,
-                    0.715 + 0.285 * cos_a + 0.140 * sin_a,
-                    0.072 - 0.072 * cos_a - 0.283 * sin_a,
-                ],
-                [
-                    0.213 - 0.213 * cos_a - 0.787 * sin_a,
-                    0.715 - 0.715 * cos_a + 0.715 * sin_a,
-                    0.072 + 0.928 * cos_a + 0.072 * sin_a,
-                ],
-            ]
-        off = mat_vec(t_mat, off)
-        mat = mat_mul(t_mat, mat)
-
-    if abs(ti_raw) > 1:
-        rad = math.radians(ti_raw / 3)
-        cos_a, sin_a = math.cos(rad), math.sin(rad)
-        ti_mat = [
-            [
-                0.213 + 0.787 * cos_a - 0.213 * sin_a,
-                0.715 - 0.715 * cos_a - 0.715 * sin_a,
-                0.072 - 0.072 * cos_a + 0.928 * sin_a,
-            ],
-            [
-                0.213 - 0.213 * cos_a + 0.143 * sin_a,
-                0.715 + 0.285 * cos_a + 0.140 * sin_a,
-                0.072 - 0.072 * cos_a - 0.283 * sin_a,
-            ],
-            [
-                0.213 - 0.213 * cos_a - 0.787 * sin_a,
-                0.715 - 0.715 * cos_a + 0.715 * sin_a,
-                0.072 + 0.928 * cos_a + 0.072 * sin_a,
-            ],
-        ]
-        off = mat_vec(ti_mat, off)
-        mat = mat_mul(ti_mat, mat)
+
+    # Temperature: warm = CSS sepia(), cool = CSS hue-rotate(negative deg)
+    if t > 0:
+        amt = min(1.0, t / 200)
+        m_temp = (
+            (1 - amt + amt * 0.393, amt * 0.769, amt * 0.189),
+            (amt * 0.349, 1 - amt + amt * 0.686, amt * 0.168),
+            (amt * 0.272, amt * 0.534, 1 - amt + amt * 0.131),
+        )
+    elif t < 0:
+        m_temp = _hue_rotate_matrix(t / 5)
+    else:
+        m_temp = _IDENTITY3
+
+    # Tint: CSS hue-rotate
+    m_tint = _hue_rotate_matrix(ti / 3) if ti else _IDENTITY3
+
+    p = _mat_mul(m_tint, _mat_mul(m_temp, m_sat))
+    scale = b * c
+    bias = 0.5 * (1 - c)
+    mat = tuple(tuple(scale * v for v in row) for row in p)
+    off = tuple(bias * (row[0] + row[1] + row[2]) for row in p)
+    return mat, off, sharpness
+
+
+def build_cc_chain(cc: dict | None) -> list[str]:
+    """Return the color-correction filters for `cc` (empty list if no-op).
+
+    All transforms go into a single colorchannelmixer so the video only takes
+    one YUV<>RGB round-trip, followed by an optional unsharp.
+    """
+    composed = compose_color_matrix(cc)
+    if composed is None:
+        return []
+    mat, off, sharpness = composed
 
     ccm = (
         f"colorchannelmixer="
@@ -228,10 +276,30 @@ def build_cc_filter(cc: dict | None, scale: str | None = None) -> str:
     filters = ["format=rgb24", ccm]
     if sharpness >= 0.001:
         filters.append(f"unsharp=5:5:{sharpness:.2f}:5:5:{sharpness:.2f}")
-    if scale_filter:
-        filters.append(scale_filter)
+    return filters
+
 
-    return ",".join(filters)
+def build_cc_filter(cc: dict | None, scale: str | None = None) -> str:
+    """Build an ffmpeg `-vf` filter string for color correction.
+
+    Args:
+        cc: Optional dict with keys brightness/contrast/saturation/sharpness/
+            shadow/temperature/tint/fade (each an integer slider value). None
+            or all-default values produces a no-op (see `scale` behavior).
+        scale: Optional trailing scale filter.
+            - None → no scale filter, input dimensions pass through.
+            - "1080:1920" → appends `scale=1080:1920:flags=lanczos,setsar=1`
+              (Burn tab's TikTok default).
+
+    Returns:
+        A comma-joined filter string ready for ffmpeg's `-vf` argument. When
+        there's nothing to do (default CC + no scale), returns "null" (ffmpeg's
+        no-op filter) so the command still validates.
+    """
+    filters = build_cc_chain(cc)
+    if scale:
+        filters.append(f"scale={scale}:flags=lanczos,setsar=1")
+    return ",".join(filters) or "null"
 
 
 async def run_color_correct(
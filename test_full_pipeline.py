@@ -1,6 +1,7 @@
 """Test the full caption pipeline 3x with @beaujenkins — no browser, no server needed."""
 import asyncio
 import csv
+import io
 from pathlib import Path
 
 
@@ -29,46 +30,54 @@ async def run_once(run_num: int, max_videos: int = 3):
         print("    FAIL — 0 URLs returned (rate limited?)")
         return False
 
-    results = []
+    # Phases 2 and 3 run concurrently across videos, a few at a time
+    sem = asyncio.Semaphore(3)
 
     # Phase 2: download + frame extract
-    for i, url in enumerate(urls):
+    async def fetch(i: int, url: str) -> dict:
         vid = url.split("/video/")[-1] if "/video/" in url else f"v{i}"
-        print(f"[2] Downloading {i+1}/{len(urls)}: {vid}")
         vpath = videos / f"{vid}.mp4"
         fpath = frames / f"{vid}.jpg"
-
-        try:
-            await download_video(url, vpath)
-            await extract_frame(vpath, fpath, timestamp=2.0)
-            results.append({"video_id": vid, "video_url": url, "frame": fpath})
-            vpath.unlink(missing_ok=True)
-        except Exception as e:
-            print(f"    ERROR: {e}")
-            results.append({"video_id": vid, "video_url": url, "frame": None, "error": str(e)})
+        async with sem:
+            print(f"[2] Downloading {i+1}/{len(urls)}: {vid}")
+            try:
+                await download_video(url, vpath)
+                await extract_frame(vpath, fpath, timestamp=2.0)
+                vpath.unlink(missing_ok=True)
+                return {"video_id": vid, "video_url": url, "frame": fpath}
+            except Exception as e:
+                print(f"    ERROR ({vid}): {e}")
+                return {"video_id": vid, "video_url": url, "frame": None, "error": str(e)}
+
+    results = list(await asyncio.gather(*(fetch(i, u) for i, u in enumerate(urls))))
 
     # Phase 3: GPT-4o vision
-    for i, r in enumerate(results):
+    async def caption_one(i: int, r: dict) -> None:
         if not r.get("frame"):
             r["caption"] = ""
-            continue
-        print(f"[3] GPT-4o caption {i+1}/{len(results)}: {r['video_id']}")
-        try:
-            caption = await extract_caption(r["frame"].read_bytes())
-            r["caption"] = caption
-            print(f"    Caption: {caption[:80]}{'...' if len(caption)>80 else ''}")
-        except Exception as e:
-            r["caption"] = ""
-            r["error"] = str(e)
-            print(f"    ERROR: {e}")
+            return
+        async with sem:
+            print(f"[3] GPT-4o caption {i+1}/{len(results)}: {r['video_id']}")
+            try:
+                frame_bytes = await asyncio.to_thread(r["frame"].read_bytes)
+                caption = await extract_caption(frame_bytes)
+                r["caption"] = caption
+                print(f"    Caption ({r['video_id']}): {caption[:80]}{'...' if len(caption)>80 else ''}")
+            except Exception as e:
+                r["caption"] = ""
+                r["error"] = str(e)
+                print(f"    ERROR ({r['video_id']}): {e}")
+
+    await asyncio.gather(*(caption_one(i, r) for i, r in enumerate(results)))
 
     # Write CSV
     csv_path = out / f"captions_run{run_num}.csv"
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["video_id", "video_url", "caption"])
-        w.writeheader()
-        for r in results:
-            w.writerow({"video_id": r["video_id"], "video_url": r["video_url"], "caption": r.get("caption", "")})
+    buf = io.StringIO(newline="")
+    w = csv.DictWriter(buf, fieldnames=["video_id", "video_url", "caption"])
+    w.writeheader()
+    for r in results:
+        w.writerow({"video_id": r["video_id"], "video_url": r["video_url"], "caption": r.get("caption", "")})
+    await asyncio.to_thread(csv_path.write_text, buf.getvalue(), encoding="utf-8", newline="")
 
     print(f"\n    CSV written: {csv_path}")
     print(f"    RUN {run_num} — SUCCESS ({len(results)} videos)")
@@ -1,6 +1,7 @@
 """End-to-end pipeline test — reuses cached frames if TikTok rate-limits."""
 import asyncio
 import csv
+import io
 import re
 import shutil
 import sys
@@ -8,14 +9,15 @@ from pathlib import Path
 
 
 CACHED_FRAMES = Path("caption_output/beaujenkins_test1/frames")
+_VIDEO_ID_RE = re.compile(r"/video/(\d+)")
 
 
-async def run_test(run_number: int):
+async def run_test(run_number: int, page):
     print(f"\n{'='*60}")
     print(f"  RUN {run_number} — @beaujenkins")
     print(f"{'='*60}\n")
 
-    from scraper.tiktok_scraper import _create_browser, collect_video_urls
+    from scraper.tiktok_scraper import collect_video_urls
     from scraper.frame_extractor import download_video, extract_frame
     from scraper.ocr_extractor import extract_caption_ocr
 
@@ -31,13 +33,7 @@ async def run_test(run_number: int):
 
     # Phase 1: Collect URLs
     print("[1/3] Collecting video URLs...")
-    pw, browser, context, page = await _create_browser(headless=False)
-    try:
-        video_urls = await collect_video_urls(page, profile_url, max_videos, sort="latest")
-    finally:
-        await context.close()
-        await browser.close()
-        await pw.stop()
+    video_urls = await collect_video_urls(page, profile_url, max_videos, sort="latest")
 
     # If rate-limited, use cached data
     use_cache = False
@@ -57,7 +53,9 @@ async def run_test(run_number: int):
         print("      ERROR: No URLs and no cache.")
         return False
 
-    # Phase 2: Download + extract frames (skip if using cache)
+    # Phase 2: Download + extract frames (skip if using cache). Videos are
+    # independent, so both phases run concurrently, a few at a time.
+    sem = asyncio.Semaphore(3)
     results = []
     if use_cache:
         print("[2/3] Using cached frames")
@@ -68,51 +66,58 @@ async def run_test(run_number: int):
             print(f"      [{i+1}/{len(video_urls)}] {vid} (cached)")
     else:
         print("[2/3] Downloading videos & extracting frames...")
-        for i, url in enumerate(video_urls):
-            m = re.search(r"/video/(\d+)", url)
+
+        async def fetch(i: int, url: str) -> dict:
+            m = _VIDEO_ID_RE.search(url)
             vid = m.group(1) if m else f"unknown_{i}"
-            print(f"      [{i+1}/{len(video_urls)}] {vid}...", end=" ", flush=True)
-            try:
-                video_path = videos_dir / f"{vid}.mp4"
-                await download_video(url, video_path)
-                frame_path = frames_dir / f"{vid}.jpg"
-                await extract_frame(video_path, frame_path, timestamp=2.0)
-                video_path.unlink(missing_ok=True)
-                results.append({"video_id": vid, "video_url": url, "frame_path": frame_path, "error": None})
-                print("OK")
-            except Exception as e:
-                print(f"ERR: {e}")
-                results.append({"video_id": vid, "video_url": url, "frame_path": None, "error": str(e)})
+            async with sem:
+                try:
+                    video_path = videos_dir / f"{vid}.mp4"
+                    await download_video(url, video_path)
+                    frame_path = frames_dir / f"{vid}.jpg"
+                    await extract_frame(video_path, frame_path, timestamp=2.0)
+                    video_path.unlink(missing_ok=True)
+                    print(f"      [{i+1}/{len(video_urls)}] {vid} OK")
+                    return {"video_id": vid, "video_url": url, "frame_path": frame_path, "error": None}
+                except Exception as e:
+                    print(f"      [{i+1}/{len(video_urls)}] {vid} ERR: {e}")
+                    return {"video_id": vid, "video_url": url, "frame_path": None, "error": str(e)}
+
+        results = list(await asyncio.gather(*(fetch(i, u) for i, u in enumerate(video_urls))))
 
     # Phase 3: OCR
     print("[3/3] Running OCR...")
-    for r in results:
+
+    async def ocr(r: dict) -> None:
         if r["error"] or not r["frame_path"]:
             r["caption"] = ""
-            continue
-        print(f"      {r['video_id']}...", end=" ", flush=True)
-        try:
-            caption = await extract_caption_ocr(r["frame_path"])
-            r["caption"] = caption
-            preview = caption[:80].replace("\n", " ") if caption else "(empty)"
-            print(f"-> {preview}")
-        except Exception as e:
-            r["caption"] = ""
-            r["error"] = str(e)
-            print(f"ERR: {e}")
+            return
+        async with sem:
+            try:
+                caption = await extract_caption_ocr(r["frame_path"])
+                r["caption"] = caption
+                preview = caption[:80].replace("\n", " ") if caption else "(empty)"
+                print(f"      {r['video_id']} -> {preview}")
+            except Exception as e:
+                r["caption"] = ""
+                r["error"] = str(e)
+                print(f"      {r['video_id']} ERR: {e}")
+
+    await asyncio.gather(*(ocr(r) for r in results))
 
     # Write CSV
     csv_path = out_dir / "captions.csv"
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["video_id", "video_url", "caption", "error"])
-        writer.writeheader()
-        for r in results:
-            writer.writerow({
-                "video_id": r["video_id"],
-                "video_url": r["video_url"],
-                "caption": r.get("caption", ""),
-                "error": r.get("error", ""),
-            })
+    buf = io.StringIO(newline="")
+    writer = csv.DictWriter(buf, fieldnames=["video_id", "video_url", "caption", "error"])
+    writer.writeheader()
+    for r in results:
+        writer.writerow({
+            "video_id": r["video_id"],
+            "video_url": r["video_url"],
+            "caption": r.get("caption", ""),
+            "error": r.get("error", ""),
+        })
+    await asyncio.to_thread(csv_path.write_text, buf.getvalue(), encoding="utf-8", newline="")
 
     with_captions = sum(1 for r in results if r.get("caption"))
     print(f"\n  CSV: {csv_path}")
@@ -121,14 +126,23 @@ async def run_test(run_number: int):
 
 
 async def main():
-    for run in range(1, 4):
-        ok = await run_test(run)
-        if not ok:
-            print(f"\n  Run {run} FAILED")
-            sys.exit(1)
-        print(f"\n  Run {run} PASSED\n")
-        if run < 3:
-            await asyncio.sleep(5)
+    from scraper.tiktok_scraper import _create_browser
+
+    # One Chromium for all three runs; a cold start costs more than a scrape.
+    pw, browser, context, page = await _create_browser(headless=False)
+    try:
+        for run in range(1, 4):
+            ok = await run_test(run, page)
+            if not ok:
+                print(f"\n  Run {run} FAILED")
+                sys.exit(1)
+            print(f"\n  Run {run} PASSED\n")
+            if run < 3:
+                await asyncio.sleep(5)
+    finally:
+        await context.close()
+        await browser.close()
+        await pw.stop()
 
     # Show all CSVs
     print("\n" + "="*60)
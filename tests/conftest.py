@@ -1,6 +1,3 @@
-from pathlib import Path
-from tempfile import TemporaryDirectory
-
 import httpx
 import pytest
 from fastapi.testclient import TestClient
@@ -14,10 +11,10 @@ from routers import projects as projects_router
 from routers import video as video_router
 
 
-@pytest.fixture
-def temp_project_dir():
-    with TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+@pytest.fixture(scope="session")
+def temp_project_dir(tmp_path_factory):
+    # Shared scratch dir; tests needing isolation use isolated_projects_root.
+    return tmp_path_factory.mktemp("artifacts")
 
 
 @pytest.fixture(autouse=True)
@@ -44,10 +41,14 @@ def isolated_projects_root(monkeypatch, tmp_path):
 @pytest.fixture(autouse=True)
 def reset_in_memory_state():
     video_router.jobs.clear()
+    video_router._disk_only_jobs.clear()
     captions_router._ws_clients.clear()
+    projects_router._stats_cache.clear()
     yield
     video_router.jobs.clear()
+    video_router._disk_only_jobs.clear()
     captions_router._ws_clients.clear()
+    projects_router._stats_cache.clear()
 
 
 @pytest.fixture
@@ -1,3 +1,8 @@
+import shutil
+from pathlib import Path
+
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
 from project_manager import (
     get_project_burn_dir,
     get_project_caption_dir,
@@ -210,3 +215,205 @@ def test_burn_folder_rename_clips_preserves_prefix(sync_client):
 
     assert not (get_project_clips_dir("rename-clips") / "job_xyz").exists()
     assert (get_project_clips_dir("rename-clips") / "rooftop-shoot" / "clip_001.mp4").exists()
+
+
+def test_burn_filters_keep_setsar_when_scale_is_skipped():
+    from routers import burn as burn_router
+
+    graph = burn_router._build_filter_complex(None, needs_scale=False)
+    assert "[0:v]setsar=1[vid]" in graph
+    assert burn_router._build_color_only_filter(None, needs_scale=False) == "setsar=1"
+
+
+def test_ws_burn_groups_matching_color_correction(sync_client, monkeypatch):
+    from routers import burn as burn_router
+
+    created = sync_client.post("/api/projects", json={"name": "Burn Group"})
+    assert created.status_code == 201
+
+    video_dir = get_project_video_dir("burn-group")
+    for n in range(3):
+        (video_dir / f"clip{n}.mp4").write_bytes(b"video")
+
+    commands = []
+
+    async def fake_run_ffmpeg(cmd):
+        commands.append(cmd)
+
+    async def fake_probe_dims(video_path):
+        return (1080, 1920)
+
+    monkeypatch.setattr(burn_router, "_run_ffmpeg", fake_run_ffmpeg)
+    monkeypatch.setattr(burn_router, "_probe_dims", fake_probe_dims)
+
+    png = "data:image/png;base64,iVBORw0KGgo="
+    cc = {"brightness": 10}
+    pairs = [
+        {"videoPath": "clip0.mp4", "overlayPng": png, "colorCorrection": cc},
+        {"videoPath": "clip1.mp4", "overlayPng": png, "colorCorrection": {"contrast": 20}},
+        {"videoPath": "clip2.mp4", "overlayPng": png, "colorCorrection": cc},
+    ]
+
+    burned_order = []
+    with sync_client.websocket_connect("/api/burn/ws") as ws:
+        ws.send_json({"project": "burn-group", "pairs": pairs})
+        while True:
+            msg = ws.receive_json()
+            if msg["event"] == "burned":
+                burned_order.append(msg["index"])
+            if msg["event"] == "complete":
+                break
+
+    assert msg["successCount"] == 3
+    assert burned_order == [0, 1, 2]
+    assert [r["index"] for r in msg["results"]] == [0, 1, 2]
+    # clip0 + clip2 share one process, clip1 gets its own
+    assert len(commands) == 2
+    outputs = [[arg for arg in cmd if arg.endswith(".mp4") and "burned_" in arg] for cmd in commands]
+    assert sorted(len(o) for o in outputs) == [1, 2]
+
+
+def test_ws_burn_group_retry_skips_outputs_already_written(sync_client, monkeypatch):
+    from routers import burn as burn_router
+
+    created = sync_client.post("/api/projects", json={"name": "Burn Retry"})
+    assert created.status_code == 201
+    video_dir = get_project_video_dir("burn-retry")
+    for n in range(3):
+        (video_dir / f"clip{n}.mp4").write_bytes(b"video")
+
+    commands = []
+
+    async def fake_run_ffmpeg(cmd):
+        outputs = [arg for arg in cmd if arg.endswith(".mp4") and "burned_" in arg]
+        commands.append(outputs)
+        # The group process finishes its first output, then dies
+        Path(outputs[0]).write_bytes(b"burned")
+        if len(outputs) > 1:
+            raise RuntimeError("ffmpeg exited 1")
+
+    async def fake_probe_dims(video_path):
+        return (1080, 1920)
+
+    monkeypatch.setattr(burn_router, "_run_ffmpeg", fake_run_ffmpeg)
+    monkeypatch.setattr(burn_router, "_probe_dims", fake_probe_dims)
+
+    png = "data:image/png;base64,iVBORw0KGgo="
+    pairs = [
+        {"videoPath": f"clip{n}.mp4", "overlayPng": png, "colorCorrection": {"brightness": 10}}
+        for n in range(3)
+    ]
+
+    burning = []
+    with sync_client.websocket_connect("/api/burn/ws") as ws:
+        ws.send_json({"project": "burn-retry", "pairs": pairs})
+        while True:
+            msg = ws.receive_json()
+            if msg["event"] == "burning":
+                burning.append(msg["index"])
+            if msg["event"] == "complete":
+                break
+
+    assert msg["successCount"] == 3
+    assert len(commands[0]) == 3
+    retried = [Path(o[0]).name for o in commands[1:]]
+    assert retried == ["burned_001.mp4", "burned_002.mp4"]
+    assert burning == [0, 1, 2]
+
+
+def test_ws_burn_batch_listed_even_if_client_leaves_mid_batch(sync_client, monkeypatch):
+    from routers import burn as burn_router
+
+    created = sync_client.post("/api/projects", json={"name": "Burn Partial"})
+    assert created.status_code == 201
+    video_dir = get_project_video_dir("burn-partial")
+    for n in range(2):
+        (video_dir / f"clip{n}.mp4").write_bytes(b"video")
+
+    # Build the index first, so listing no longer rescans batch directories
+    listed = sync_client.get("/api/burn/batches", params={"project": "burn-partial"})
+    assert listed.json()["batches"] == []
+
+    async def fake_run_ffmpeg(cmd):
+        for arg in cmd:
+            if arg.endswith(".mp4") and "burned_" in arg:
+                Path(arg).write_bytes(b"burned")
+
+    async def fake_probe_dims(video_path):
+        return (1080, 1920)
+
+    monkeypatch.setattr(burn_router, "_run_ffmpeg", fake_run_ffmpeg)
+    monkeypatch.setattr(burn_router, "_probe_dims", fake_probe_dims)
+
+    # Drop the connection on the first send after item 0 is reported burned
+    real_send_json = WebSocket.send_json
+    sent_burned = []
+
+    async def flaky_send_json(self, data, mode="text"):
+        if sent_burned:
+            raise WebSocketDisconnect(code=1001)
+        await real_send_json(self, data, mode)
+        if data.get("event") == "burned":
+            sent_burned.append(data)
+
+    monkeypatch.setattr(WebSocket, "send_json", flaky_send_json)
+
+    png = "data:image/png;base64,iVBORw0KGgo="
+    pairs = [
+        {"videoPath": "clip0.mp4", "overlayPng": png, "colorCorrection": {"brightness": 10}},
+        {"videoPath": "clip1.mp4", "overlayPng": png, "colorCorrection": {"contrast": 20}},
+    ]
+    with sync_client.websocket_connect("/api/burn/ws") as ws:
+        ws.send_json({"project": "burn-partial", "pairs": pairs})
+        while ws.receive_json()["event"] != "burned":
+            pass
+
+    batches = sync_client.get(
+        "/api/burn/batches", params={"project": "burn-partial"}
+    ).json()["batches"]
+    assert len(batches) == 1
+    assert batches[0]["count"] >= 1
+
+
+def test_burn_batches_index_tracks_new_and_renamed_batches(sync_client):
+    from routers import burn as burn_router
+
+    created = sync_client.post("/api/projects", json={"name": "Batch Index"})
+    assert created.status_code == 201
+
+    burn_dir = get_project_burn_dir("batch-index")
+    (burn_dir / "old-batch").mkdir(parents=True, exist_ok=True)
+    (burn_dir / "old-batch" / "burned_000.mp4").write_bytes(b"burned")
+
+    # First listing builds the index from a one-off scan
+    batches = sync_client.get("/api/burn/batches", params={"project": "batch-index"}).json()["batches"]
+    assert [b["id"] for b in batches] == ["old-batch"]
+    assert (burn_dir / burn_router._BATCH_INDEX).exists()
+
+    new_dir = burn_dir / "new-batch"
+    new_dir.mkdir()
+    (new_dir / "burned_000.mp4").write_bytes(b"a")
+    (new_dir / "burned_001.mp4").write_bytes(b"b")
+    burn_router._record_batch(new_dir)
+
+    renamed = sync_client.patch(
+        "/api/burn/batches/old-batch/rename",
+        params={"project": "batch-index"},
+        json={"label": "Launch Week"},
+    )
+    assert renamed.status_code == 200
+
+    batches = sync_client.get("/api/burn/batches", params={"project": "batch-index"}).json()["batches"]
+    by_id = {b["id"]: b for b in batches}
+    assert by_id["new-batch"]["count"] == 2
+    assert by_id["old-batch"]["label"] == "Launch Week"
+
+    # Listing compacts superseded lines back to one per batch
+    index_path = burn_dir / burn_router._BATCH_INDEX
+    assert len(index_path.read_text().splitlines()) == 2
+
+    # A batch deleted outside the API drops out of the listing and the index
+    shutil.rmtree(new_dir)
+    batches = sync_client.get("/api/burn/batches", params={"project": "batch-index"}).json()["batches"]
+    assert [b["id"] for b in batches] == ["old-batch"]
+    assert len(index_path.read_text().splitlines()) == 1
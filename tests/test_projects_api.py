@@ -1,3 +1,5 @@
+import os
+
 from project_manager import (
     get_project_burn_dir,
     get_project_caption_dir,
@@ -31,6 +33,13 @@ def test_projects_crud_and_stats(sync_client):
     assert stats_payload["videos"]["count"] == 1
     assert stats_payload["captions"]["count"] == 1
     assert stats_payload["burned"]["count"] == 1
+    assert stats_payload["last_activity"] is not None
+    assert "max_mtime" not in stats_payload["videos"]
+
+    # New files invalidate the cached stats immediately via the dir mtime.
+    (video_dir / "clip2.mp4").write_bytes(b"video")
+    refreshed = sync_client.get("/api/projects/my-launch/stats")
+    assert refreshed.json()["videos"]["count"] == 2
 
     deleted = sync_client.delete("/api/projects/my-launch")
     assert deleted.status_code == 200
@@ -50,3 +59,39 @@ def test_projects_list_returns_default(sync_client):
     assert response.status_code == 200
     names = [project["name"] for project in response.json()["projects"]]
     assert "quick-test" in names
+
+
+def test_import_legacy_symlinks_flattened_tree(sync_client, isolated_projects_root):
+    base_dir = isolated_projects_root.parent
+    nested = base_dir / "output" / "job1"
+    nested.mkdir(parents=True)
+    (nested / "clip.MP4").write_bytes(b"video")
+    (nested / "notes.txt").write_text("skip")
+    (base_dir / "caption_output").mkdir()
+    (base_dir / "caption_output" / "caps.csv").write_text("a\n")
+
+    first = sync_client.post("/api/projects/import-legacy")
+    assert first.status_code == 200
+    payload = first.json()
+    assert payload["imported"] == {"videos": 1, "captions": 1, "burned": 0}
+    assert payload["details"]["video_files"] == ["job1_clip.MP4"]
+
+    link = get_project_video_dir(payload["project"]) / "job1_clip.MP4"
+    assert link.is_symlink()
+    assert link.read_bytes() == b"video"
+
+    again = sync_client.post("/api/projects/import-legacy")
+    assert again.status_code == 409
+
+
+def test_import_legacy_links_point_at_the_real_file(sync_client, isolated_projects_root):
+    base_dir = isolated_projects_root.parent
+    real = base_dir / "elsewhere" / "clip.mp4"
+    real.parent.mkdir()
+    real.write_bytes(b"video")
+    (base_dir / "output").mkdir()
+    (base_dir / "output" / "linked.mp4").symlink_to(real)
+
+    payload = sync_client.post("/api/projects/import-legacy").json()
+    link = get_project_video_dir(payload["project"]) / "linked.mp4"
+    assert os.readlink(link) == str(real.resolve())
@@ -17,3 +17,41 @@ def test_remove_text_rejects_none_image():
     """remove_text raises ValueError when given None."""
     with pytest.raises(ValueError, match="image"):
         asyncio.run(remove_text(None, None))  # type: ignore[arg-type]
+
+
+def test_generate_uses_sync_wait_then_backs_off_polling(monkeypatch):
+    """generate asks Replicate to block on create, then polls with growing delays."""
+    import httpx
+
+    from providers import replicate
+
+    monkeypatch.setitem(replicate.API_KEYS, "replicate", "test-token")
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(replicate.asyncio, "sleep", fake_sleep)
+
+    polls = iter(["processing", "processing", "succeeded"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            assert request.headers["Prefer"] == "wait=60"
+            return httpx.Response(201, json={"id": "p1", "status": "processing"})
+        status = next(polls)
+        body = {"id": "p1", "status": status}
+        if status == "succeeded":
+            body["output"] = "https://cdn.example/video.mp4"
+        return httpx.Response(200, json=body)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await replicate.generate(
+                "a prompt",
+                {"model_id": "minimax/hailuo-2.3", "entry": {}},
+                client,
+            )
+
+    assert asyncio.run(run()) == "https://cdn.example/video.mp4"
+    assert sleeps == [0.5, 0.75, 1.125]
@@ -0,0 +1,79 @@
+import json
+
+import httpx
+
+from scraper import tiktok_api
+
+_PROFILE_HTML = (
+    '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+    + json.dumps({
+        "__DEFAULT_SCOPE__": {
+            "webapp.user-detail": {"userInfo": {"user": {"secUid": "SEC"}}}
+        }
+    })
+    + "</script>"
+)
+
+
+def _patch_client(monkeypatch, handler):
+    real_client = httpx.AsyncClient
+
+    def fake_client(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(tiktok_api.httpx, "AsyncClient", fake_client)
+    monkeypatch.setattr(tiktok_api, "_sec_uid_cache", {})
+
+
+async def test_fetch_profile_items_pages_through_item_list(monkeypatch):
+    def handler(request):
+        if request.url.path != "/api/post/item_list/":
+            return httpx.Response(200, text=_PROFILE_HTML)
+        assert request.url.params["secUid"] == "SEC"
+        if request.url.params["cursor"] == "0":
+            return httpx.Response(200, json={
+                "itemList": [{"id": "1", "desc": "first"}, {"id": "2", "desc": "second"}],
+                "hasMore": True,
+                "cursor": 99,
+            })
+        return httpx.Response(200, json={"itemList": [{"id": "3"}], "hasMore": False})
+
+    _patch_client(monkeypatch, handler)
+    items = await tiktok_api.fetch_profile_items("someone", 10)
+
+    assert [i["video_url"] for i in items] == [
+        f"https://www.tiktok.com/@someone/video/{n}" for n in ("1", "2", "3")
+    ]
+    assert items[0]["description"] == "first"
+
+
+async def test_fetch_profile_items_returns_none_when_api_refuses(monkeypatch):
+    def handler(request):
+        if request.url.path == "/api/post/item_list/":
+            return httpx.Response(200, text="")  # unsigned request
+        return httpx.Response(200, text=_PROFILE_HTML)
+
+    _patch_client(monkeypatch, handler)
+    assert await tiktok_api.fetch_profile_items("someone", 10) is None
+
+
+async def test_list_profile_videos_prefers_api_over_yt_dlp(monkeypatch):
+    from scraper import frame_extractor
+
+    async def fake_fetch(username, max_videos, storage_state=None):
+        assert username == "someone"
+        return [{"video_url": "https://www.tiktok.com/@someone/video/1"}]
+
+    async def no_subprocess(*args, **kwargs):
+        raise AssertionError("yt-dlp should not run when the API answers")
+
+    monkeypatch.setattr(frame_extractor, "_check_deps", lambda: None)
+    monkeypatch.setattr(frame_extractor, "fetch_profile_items", fake_fetch)
+    monkeypatch.setattr(
+        frame_extractor.asyncio, "create_subprocess_exec", no_subprocess
+    )
+
+    urls = await frame_extractor.list_profile_videos(
+        "https://www.tiktok.com/@someone", 5
+    )
+    assert urls == ["https://www.tiktok.com/@someone/video/1"]
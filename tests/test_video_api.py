@@ -1,11 +1,31 @@
+import base64
+import json
 import time
 import zipfile
+from datetime import datetime, timezone
 from io import BytesIO
+from pathlib import Path
 
+from providers.base import encode_data_uri
 from routers import video as video_router
 
 
-def test_generate_job_lifecycle_and_download(sync_client, monkeypatch):
+def _poll_until(check, timeout=1.0):
+    """Call check() with backoff (1 ms doubling to 50 ms) until truthy or timeout."""
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        result = check()
+        if result or time.monotonic() >= deadline:
+            return result
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+def test_generate_job_lifecycle_and_download(
+    sync_client, monkeypatch, isolated_projects_root
+):
+    monkeypatch.setattr(video_router, "PROJECTS_DIR", isolated_projects_root)
     provider_id = next(iter(video_router.PROVIDERS.keys()))
     key_id = video_router.PROVIDERS[provider_id]["key_id"]
     monkeypatch.setitem(video_router.API_KEYS, key_id, "test-key")
@@ -22,6 +42,7 @@ def test_generate_job_lifecycle_and_download(sync_client, monkeypatch):
         jobs,
         output_dir,
         url_prefix,
+        **kwargs,
     ):
         entry = jobs[job_id]["videos"][index]
         filename = f"fake_{index}.mp4"
@@ -48,14 +69,15 @@ def test_generate_job_lifecycle_and_download(sync_client, monkeypatch):
     job_id = response.json()["job_id"]
 
     final_job = None
-    for _ in range(50):
+
+    def _job_done():
+        nonlocal final_job
         job_response = sync_client.get(f"/api/video/jobs/{job_id}")
         assert job_response.status_code == 200
         final_job = job_response.json()
-        statuses = [video["status"] for video in final_job["videos"]]
-        if all(status == "done" for status in statuses):
-            break
-        time.sleep(0.02)
+        return all(video["status"] == "done" for video in final_job["videos"])
+
+    _poll_until(_job_done)
 
     assert final_job is not None
     assert all(video["status"] == "done" for video in final_job["videos"])
@@ -82,3 +104,159 @@ def test_generate_rejects_unknown_provider(sync_client):
         },
     )
     assert response.status_code == 400
+
+
+def test_generate_passes_uploaded_media_as_data_uri(
+    sync_client, monkeypatch, isolated_projects_root
+):
+    monkeypatch.setattr(video_router, "PROJECTS_DIR", isolated_projects_root)
+    provider_id = next(iter(video_router.PROVIDERS.keys()))
+    key_id = video_router.PROVIDERS[provider_id]["key_id"]
+    monkeypatch.setitem(video_router.API_KEYS, key_id, "test-key")
+
+    seen: dict = {}
+
+    async def fake_generate_one(
+        job_id, index, provider, prompt, aspect_ratio, resolution, duration,
+        image_data_uri, jobs, output_dir, url_prefix, **kwargs,
+    ):
+        seen["image"] = image_data_uri
+        seen["last_image"] = kwargs.get("last_image_data_uri")
+        jobs[job_id]["videos"][index]["status"] = "done"
+
+    monkeypatch.setattr(video_router, "generate_one", fake_generate_one)
+
+    response = sync_client.post(
+        "/api/video/generate",
+        data={"prompt": "p", "provider": provider_id, "count": "1", "project": "video-suite"},
+        files={
+            "media": ("first.png", b"\x89PNG first", "image/png"),
+            "last_image": ("last.jpg", b"last", "image/jpeg"),
+        },
+    )
+    assert response.status_code == 200
+
+    _poll_until(lambda: "image" in seen)
+
+    assert seen["image"] == "data:image/png;base64,iVBORyBmaXJzdA=="
+    assert seen["last_image"] == "data:image/jpeg;base64,bGFzdA=="
+
+
+def test_encode_data_uri_matches_one_shot_encode_across_short_reads():
+    class ShortReads(BytesIO):
+        # Odd-sized short reads exercise the carry between chunks.
+        def read(self, size=-1):
+            return super().read(min(size, 1000) if size > 0 else 1000)
+
+    payload = bytes(range(256)) * 3001
+    uri = encode_data_uri(ShortReads(payload), "image/png")
+    assert uri == "data:image/png;base64," + base64.b64encode(payload).decode()
+
+
+def test_finished_jobs_pruned_from_memory_stay_on_disk(
+    sync_client, monkeypatch, isolated_projects_root
+):
+    monkeypatch.setattr(video_router, "PROJECTS_DIR", isolated_projects_root)
+    monkeypatch.setattr(video_router, "JOB_MEMORY_TTL_SECS", 60)
+    video_router.get_project_video_dir("video-suite").mkdir(parents=True, exist_ok=True)
+    video_router.jobs["old-job"] = {
+        "id": "old-job",
+        "project": "video-suite",
+        "created_at": "2020-01-01T00:00:00+00:00",
+        "videos": [{"index": 0, "status": "done"}],
+    }
+    video_router.jobs["new-job"] = {
+        "id": "new-job",
+        "project": "video-suite",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "videos": [{"index": 0, "status": "done"}],
+    }
+    video_router._save_jobs("video-suite")
+
+    listed = sync_client.get("/api/video/jobs", params={"project": "video-suite"})
+    assert {j["id"] for j in listed.json()} == {"old-job", "new-job"}
+    assert "old-job" not in video_router.jobs
+
+    # Reloading from disk leaves stale jobs out of memory but still returns them
+    assert "old-job" in video_router._load_jobs("video-suite")
+    assert "old-job" not in video_router.jobs
+
+    # A later save must not drop the pruned job from jobs.json
+    video_router._save_jobs("video-suite")
+    assert sync_client.get("/api/video/jobs/old-job").status_code == 200
+
+    deleted = sync_client.delete("/api/video/jobs/old-job", params={"project": "video-suite"})
+    assert deleted.status_code == 200
+    listed = sync_client.get("/api/video/jobs", params={"project": "video-suite"})
+    assert [j["id"] for j in listed.json()] == ["new-job"]
+
+
+def test_save_jobs_reads_jobs_json_once_and_never_clobbers_it(
+    monkeypatch, isolated_projects_root
+):
+    monkeypatch.setattr(video_router, "PROJECTS_DIR", isolated_projects_root)
+    jobs_path = video_router._jobs_path("video-suite")
+    jobs_path.parent.mkdir(parents=True, exist_ok=True)
+    jobs_path.write_text("{not json", encoding="utf-8")
+
+    video_router.jobs["new-job"] = {"id": "new-job", "project": "video-suite", "videos": []}
+    video_router._save_jobs("video-suite")
+    assert jobs_path.read_text(encoding="utf-8") == "{not json"
+
+    jobs_path.write_text(json.dumps({"old-job": {"id": "old-job"}}), encoding="utf-8")
+    video_router._save_jobs("video-suite")
+
+    # Later saves merge from memory instead of re-reading the file
+    real_read_text = Path.read_text
+
+    def guarded_read_text(self, *args, **kwargs):
+        assert self != jobs_path, "jobs.json re-read on save"
+        return real_read_text(self, *args, **kwargs)
+
+    video_router.jobs["new-job"]["videos"] = [{"index": 0, "status": "done"}]
+    with monkeypatch.context() as m:
+        m.setattr(Path, "read_text", guarded_read_text)
+        video_router._save_jobs("video-suite")
+
+    saved = json.loads(jobs_path.read_text(encoding="utf-8"))
+    assert set(saved) == {"old-job", "new-job"}
+    assert saved["new-job"]["videos"][0]["status"] == "done"
+
+
+def test_bulk_download_zips_done_videos_per_job(
+    sync_client, monkeypatch, isolated_projects_root
+):
+    monkeypatch.setattr(video_router, "PROJECTS_DIR", isolated_projects_root)
+    video_dir = video_router.get_project_video_dir("video-suite")
+    video_dir.mkdir(parents=True, exist_ok=True)
+    (video_dir / "a.mp4").write_bytes(b"a-bytes")
+    (video_dir / "b_crop.mp4").write_bytes(b"b-bytes")
+    video_router.jobs["job-a"] = {
+        "id": "job-a",
+        "project": "video-suite",
+        "videos": [
+            {"index": 0, "status": "done", "file": "a.mp4"},
+            {"index": 1, "status": "error"},
+        ],
+    }
+    video_router.jobs["job-b"] = {
+        "id": "job-b",
+        "project": "video-suite",
+        "videos": [{"index": 0, "status": "done", "crops": [{"file": "b_crop.mp4"}]}],
+    }
+
+    response = sync_client.post(
+        "/api/video/bulk-download",
+        json={"job_ids": ["job-a", "job-b", "missing"], "project": "video-suite"},
+    )
+    assert response.status_code == 200
+    assert "_2videos.zip" in response.headers["content-disposition"]
+    with zipfile.ZipFile(BytesIO(response.content)) as archive:
+        assert sorted(archive.namelist()) == ["job-a/a.mp4", "job-b/b_crop.mp4"]
+        assert archive.read("job-a/a.mp4") == b"a-bytes"
+
+    empty = sync_client.post(
+        "/api/video/bulk-download",
+        json={"job_ids": ["missing"], "project": "video-suite"},
+    )
+    assert empty.status_code == 400